@@ -1,23 +1,34 @@
 import re
 import json
+import mmap
+import os
 import sys
+from codecs import escape_decode
+from contextlib import nullcontext
+
+# regex for n[0] = '...';
+# it can span multiple lines and contains \n
+FRAME_RE = re.compile(rb"n\[\d+\] = '(.*?)';", re.DOTALL)
 
 def extract_frames(html_path, out_path):
-    with open(html_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    # regex for n[0] = '...';
-    # it can span multiple lines and contains \n
-    pattern = r"n\[\d+\] = '(.*?)';"
-    matches = re.findall(pattern, content, re.DOTALL)
-    
-    print(f"Found {len(matches)} frames.")
-    
-    # Unescape the strings
-    frames = [m.encode().decode('unicode_escape') for m in matches]
-    
-    with open(out_path, 'w', encoding='utf-8') as f:
-        json.dump(frames, f, indent=2)
+    count = 0
+    # mmap refuses zero-length files, so an empty source is scanned as b''
+    with open(html_path, 'rb') as f, \
+            (mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+             if os.fstat(f.fileno()).st_size else nullcontext(b'')) as content, \
+            open(out_path, 'w', encoding='utf-8') as out:
+        # Stream each frame straight into the JSON array instead of
+        # collecting every match first (same layout as json.dump indent=2)
+        out.write('[')
+        for m in FRAME_RE.finditer(content):
+            # Unescape the string (one C-level pass over the raw bytes)
+            frame = escape_decode(m.group(1))[0].decode('utf-8', 'replace')
+            out.write(',\n  ' if count else '\n  ')
+            json.dump(frame, out)
+            count += 1
+        out.write('\n]' if count else ']')
+
+    print(f"Found {count} frames.")
 
 if __name__ == "__main__":
     extract_frames('jcvd_source_3.html', 'jcvd_frames.json')
@@ -1,45 +1,126 @@
+import io
 import json
 import os
+import re
+from collections import defaultdict
+from functools import lru_cache
+from multiprocessing import Pool
+from queue import Queue
+from threading import Thread
 from PIL import Image, ImageDraw, ImageFont
 
-def render_ascii_frames(json_path, font_path, out_dir):
-    with open(json_path, 'r', encoding='utf-8') as f:
-        frames = json.load(f)
-    
+# Grid: 100 cols x 54 rows
+# Cell size: 10x20
+CELL_W = 10
+CELL_H = 20
+IMG_W = 100 * CELL_W
+IMG_H = 54 * CELL_H
+FONT_SIZE = 18 # 18pt should fit well in 10x20
+# Frames are intermediates for the jcvd sequence layer, so favour encode
+# speed over file size (zlib level 1 vs Pillow's default 6)
+PNG_COMPRESS_LEVEL = 1
+# Encoded frames waiting on the writer thread before the main loop blocks
+WRITE_QUEUE_SIZE = 8
+
+WHITE = (255, 255, 255, 255)
+NON_SPACE_RE = re.compile(r'\S')
+
+# Fonts don't pickle reliably, so each worker process opens its own copy
+# lazily; both caches live for the life of the process, so repeat runs in
+# the same interpreter don't reopen or re-rasterize anything
+@lru_cache(maxsize=None)
+def _load_font(font_path, size):
+    return ImageFont.truetype(font_path, size)
+
+@lru_cache(maxsize=256)
+def _glyph(char, font_path, size):
+    font = _load_font(font_path, size)
+    # Same coverage mask draw.text would produce at the cell origin
+    _, _, right, bottom = font.getbbox(char)
+    mask = Image.new('L', (max(right, 1), max(bottom, 1)), 0)
+    ImageDraw.Draw(mask).text((0, 0), char, font=font, fill=255)
+    return mask
+
+def _render_one(args):
+    i, frame, font_path = args
+
+    # Create image with transparent background (RGBA)
+    img = Image.new('RGBA', (IMG_W, IMG_H), (0, 0, 0, 0))
+
+    # Let the regex engine skip blank cells, and group the rest by character
+    # so each glyph is looked up once per frame rather than once per cell
+    cells = defaultdict(list)
+    for row_idx, line in enumerate(frame.split('\n')):
+        y = row_idx * CELL_H
+        for m in NON_SPACE_RE.finditer(line):
+            cells[m.group()].append((m.start() * CELL_W, y))
+
+    for char, positions in cells.items():
+        # Paste white through the cached glyph mask
+        mask = _glyph(char, font_path, FONT_SIZE)
+        w, h = mask.size
+        for x, y in positions:
+            img.paste(WHITE, (x, y, x + w, y + h), mask)
+
+    # Encode here, in the worker; the parent only has to write the bytes
+    buf = io.BytesIO()
+    img.save(buf, format='PNG', compress_level=PNG_COMPRESS_LEVEL)
+    return i, buf.getvalue()
+
+def _write_frames(queue, out_dir, errors):
+    while True:
+        item = queue.get()
+        if item is None:
+            break
+        # After a failure keep draining, so the producer never blocks on a
+        # full queue; it picks the error up from `errors` and re-raises it
+        if errors:
+            continue
+        i, data = item
+        try:
+            with open(os.path.join(out_dir, f"frame_{i:04d}.png"), 'wb') as f:
+                f.write(data)
+        except Exception as e:
+            errors.append(e)
+
+def render_ascii_frames(json_path, font_path, out_dir, workers=None):
+    # One bulk read; json.loads decodes UTF-8 bytes itself, skipping the
+    # incremental text-mode reader
+    with open(json_path, 'rb') as f:
+        frames = json.loads(f.read())
+
     if not os.path.exists(out_dir):
         os.makedirs(out_dir)
-    
-    # Grid: 100 cols x 54 rows
-    # Cell size: 10x20
-    cell_w = 10
-    cell_h = 20
-    img_w = 100 * cell_w
-    img_h = 54 * cell_h
-    
-    # Load font
+
+    # Load font once up front so a bad path fails before any workers start
     try:
-        font = ImageFont.truetype(font_path, 18) # 18pt should fit well in 10x20
+        _load_font(font_path, FONT_SIZE)
     except Exception as e:
         print(f"Failed to load font: {e}")
         return
 
-    for i, frame in enumerate(frames):
-        # Create image with transparent background (RGBA)
-        img = Image.new('RGBA', (img_w, img_h), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(img)
-        
-        lines = frame.split('\n')
-        for row_idx, line in enumerate(lines):
-            for col_idx, char in enumerate(line):
-                if char.isspace():
-                    continue
-                # Draw white character
-                draw.text((col_idx * cell_w, row_idx * cell_h), char, font=font, fill=(255, 255, 255, 255))
-        
-        out_path = os.path.join(out_dir, f"frame_{i:04d}.png")
-        img.save(out_path)
-        if i % 20 == 0:
-            print(f"Rendered {i}/{len(frames)} frames...")
+    # Disk writes go through a background thread so draining the pool
+    # never waits on file I/O
+    queue = Queue(maxsize=WRITE_QUEUE_SIZE)
+    write_errors = []
+    writer = Thread(target=_write_frames, args=(queue, out_dir, write_errors), daemon=True)
+    writer.start()
+
+    # Frames are independent, so fan them out across cores
+    tasks = ((i, frame, font_path) for i, frame in enumerate(frames))
+    try:
+        with Pool(workers or os.cpu_count()) as pool:
+            for done, item in enumerate(pool.imap_unordered(_render_one, tasks, chunksize=8), 1):
+                queue.put(item)
+                if write_errors:
+                    raise write_errors[0]
+                if done % 20 == 0:
+                    print(f"Rendered {done}/{len(frames)} frames...")
+    finally:
+        queue.put(None)
+        writer.join()
+    if write_errors:
+        raise write_errors[0]
 
     print(f"Finished rendering {len(frames)} frames to {out_dir}")
 
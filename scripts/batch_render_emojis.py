@@ -1,15 +1,21 @@
 import os
 import json
+import hashlib
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 
-def run_cmd(cmd, cwd=None):
-    print(f"Running: {' '.join(cmd)}")
-    result = subprocess.run(cmd, capture_output=True, text=True, cwd=cwd)
-    if result.returncode != 0:
-        print(f"Error: {result.stderr}")
-    else:
-        print(result.stdout)
-    return result
+def run_cmd(cmd, cwd=None, prefix=""):
+    print(f"{prefix}Running: {' '.join(cmd)}")
+    # Stream output line by line instead of buffering the whole run;
+    # stderr is folded in so errors show up where they happened
+    output = []
+    with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, cwd=cwd) as proc:
+        for line in proc.stdout:
+            print(f"{prefix}{line}", end="")
+            output.append(line)
+    if proc.returncode != 0:
+        print(f"{prefix}Error: exit code {proc.returncode}")
+    return subprocess.CompletedProcess(cmd, proc.returncode, "".join(output))
 
 source_dir = "/System/Volumes/Data/Users/coltonbatts/Projects/assets/creative-library/Plugins-Templates/Retro Emoji Motion Pack/Main"
 # Output relative to VCR root
@@ -17,14 +23,22 @@ output_rel_dir = "out/batch_emojis"
 manifest_rel_dir = "manifests/render/batch"
 vcr_root = "/Users/coltonbatts/Desktop/VCR"
 vcr_path = "./target/debug/vcr"
+# Renders share the GPU, so keep concurrency modest
+render_workers = 3
 
 os.makedirs(os.path.join(vcr_root, output_rel_dir), exist_ok=True)
 os.makedirs(os.path.join(vcr_root, manifest_rel_dir), exist_ok=True)
 
 # 1. Get existing library items
-lib_list = run_cmd([vcr_path, "library", "list"], cwd=vcr_root).stdout
-existing_ids = [line.split()[0] for line in lib_list.splitlines() if line.strip()]
+# Read the registry that `vcr library list` prints from directly; saves a
+# process spawn, and a set makes the per-item membership test O(1)
+registry_path = os.path.join(vcr_root, "library", "library.json")
+existing_ids = set()
+if os.path.exists(registry_path):
+    with open(registry_path, encoding="utf-8") as f:
+        existing_ids = {item["id"] for item in json.load(f).get("items", [])}
 
+render_jobs = []
 for i in range(1, 33):
     item_id = f"retro-emoji-{i:02d}"
     filename = f"Retro Emoji {i:02d}.mov"
@@ -56,15 +70,39 @@ layers:
     video:
       path: "library:{item_id}"
 """
-    with open(manifest_abs_path, 'w') as f:
-        f.write(manifest_content)
-
-    # 4. Render
     # Use relative path for output to satisfy security check
     rel_output_mov = os.path.join(output_rel_dir, f"{item_id}.mov")
     rel_manifest_path = os.path.join(manifest_rel_dir, f"{item_id}.vcr")
-    
+
+    # Skip the render when neither the manifest nor the source changed since
+    # the last successful run (recorded in a .hash sidecar next to the .mov)
+    digest = hashlib.md5(f"{manifest_content}\0{os.path.getmtime(source_path)}".encode()).hexdigest()
+    output_abs_path = os.path.join(vcr_root, rel_output_mov)
+    hash_path = os.path.splitext(output_abs_path)[0] + ".hash"
+    if os.path.exists(output_abs_path) and os.path.exists(hash_path):
+        with open(hash_path, encoding="utf-8") as f:
+            if f.read() == digest:
+                print(f"Skipping {item_id}, unchanged since last render")
+                continue
+
+    with open(manifest_abs_path, 'w', encoding="utf-8") as f:
+        f.write(manifest_content)
+
+    render_jobs.append((item_id, rel_manifest_path, rel_output_mov, hash_path, digest))
+
+# 4. Render
+# Registration above is sequential (it mutates the library); the renders
+# are independent, so run a few at once
+def render_one(job):
+    item_id, rel_manifest_path, rel_output_mov, hash_path, digest = job
     print(f"Rendering {item_id} to {rel_output_mov}...")
-    run_cmd([vcr_path, "render", rel_manifest_path, "-o", rel_output_mov], cwd=vcr_root)
+    result = run_cmd([vcr_path, "render", rel_manifest_path, "-o", rel_output_mov], cwd=vcr_root, prefix=f"[{item_id}] ")
+    if result.returncode == 0:
+        with open(hash_path, 'w', encoding="utf-8") as f:
+            f.write(digest)
+    return result
+
+with ThreadPoolExecutor(max_workers=render_workers) as pool:
+    list(pool.map(render_one, render_jobs))
 
 print("Batch processing complete.")
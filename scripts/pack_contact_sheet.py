@@ -7,11 +7,12 @@ import argparse
 import json
 import math
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 
 try:
-    from PIL import Image, ImageDraw, ImageFont, ImageOps
+    from PIL import Image, ImageDraw, ImageFont
 except ImportError as exc:  # pragma: no cover - handled at runtime
     print(
         "Missing dependency: Pillow. Run scripts/pack_contact_sheet.sh or install via pip.",
@@ -135,6 +136,61 @@ def draw_checkerboard(
             )
 
 
+def checkerboard_tile(w: int, h: int, square: int) -> Image.Image:
+    """Render the checkerboard and tile border once so each tile is a single paste."""
+    # draw_checkerboard covers x..x+w inclusive, hence the extra pixel.
+    tile = Image.new("RGBA", (w + 1, h + 1))
+    draw = ImageDraw.Draw(tile)
+    draw_checkerboard(draw, 0, 0, w, h, square)
+    # With --inner-padding >= 1 thumbnails never reach the border;
+    # render_contact_sheet redraws it when they can.
+    draw.rectangle([0, 0, w, h], outline=(130, 130, 130, 255), width=1)
+    return tile
+
+
+# Large sources are box-reduced by an integer factor until they are within
+# this multiple of the target, then finished with LANCZOS. Same idea as
+# Pillow's resize(reducing_gap=...), which it silently skips for RGBA; 3.0
+# is visually indistinguishable from a plain LANCZOS resize.
+THUMB_REDUCING_GAP = 3.0
+
+
+def contain_size(width: int, height: int, box: tuple[int, int]) -> tuple[int, int]:
+    # Same sizing rule as ImageOps.contain.
+    im_ratio = width / height
+    box_ratio = box[0] / box[1]
+    if im_ratio > box_ratio:
+        return box[0], round(height / width * box[0])
+    if im_ratio < box_ratio:
+        return round(width / height * box[1]), box[1]
+    return box
+
+
+def fit_thumbnail(item: PackItem, size: tuple[int, int]) -> Image.Image:
+    # Also fills in the item's width/height when pack.json omits them.
+    if not item.path.exists():
+        raise FileNotFoundError(f"Missing source image for '{item.item_id}': {item.path}")
+
+    with Image.open(item.path) as src:
+        actual_w, actual_h = src.size
+        item.width = item.width or actual_w
+        item.height = item.height or actual_h
+        target = contain_size(actual_w, actual_h, size)
+        # JPEG sources decode at a reduced scale; no-op for other formats.
+        src.draft("RGB", target)
+        # Premultiplied, so the box reduce doesn't bleed colour out of
+        # transparent pixels.
+        img = src.convert("RGBA").convert("RGBa")
+
+    factor = (
+        int(img.width / target[0] / THUMB_REDUCING_GAP) or 1,
+        int(img.height / target[1] / THUMB_REDUCING_GAP) or 1,
+    )
+    if factor != (1, 1):
+        img = img.reduce(factor)
+    return img.resize(target, Image.Resampling.LANCZOS).convert("RGBA")
+
+
 def choose_output_paths(
     pack_dir: Path, out: str | None, index_out: str | None
 ) -> tuple[Path, Path]:
@@ -170,35 +226,36 @@ def render_contact_sheet(
     sheet = Image.new("RGBA", (sheet_w, sheet_h), (20, 20, 20, 255))
     draw = ImageDraw.Draw(sheet)
     font = ImageFont.load_default()
+    checker_tile = checkerboard_tile(thumb, thumb, checker)
 
-    for i, item in enumerate(items):
-        row = i // cols
-        col = i % cols
-        x = tile_padding + col * (thumb + tile_padding)
-        y = tile_padding + row * (thumb + label_h + tile_padding)
-
-        draw_checkerboard(draw, x, y, thumb, thumb, checker)
-
-        if not item.path.exists():
-            raise FileNotFoundError(f"Missing source image for '{item.item_id}': {item.path}")
-
-        with Image.open(item.path).convert("RGBA") as img:
-            actual_w, actual_h = img.size
-            item.width = item.width or actual_w
-            item.height = item.height or actual_h
-            fitted = ImageOps.contain(
-                img,
-                (thumb - (inner_padding * 2), thumb - (inner_padding * 2)),
-                Image.Resampling.LANCZOS,
-            )
+    fit_size = (thumb - (inner_padding * 2), thumb - (inner_padding * 2))
+
+    labels: list[tuple[tuple[int, int], str]] = []
+
+    # Decoding and resampling dominate and Pillow releases the GIL for both,
+    # so fit thumbnails on a thread pool and composite them in order here.
+    with ThreadPoolExecutor() as pool:
+        fitted_images = pool.map(lambda item: fit_thumbnail(item, fit_size), items)
+        for i, (item, fitted) in enumerate(zip(items, fitted_images)):
+            row = i // cols
+            col = i % cols
+            x = tile_padding + col * (thumb + tile_padding)
+            y = tile_padding + row * (thumb + label_h + tile_padding)
+
+            sheet.paste(checker_tile, (x, y))
+
+            px = x + (thumb - fitted.width) // 2
+            py = y + (thumb - fitted.height) // 2
+            sheet.alpha_composite(fitted, (px, py))
+            if inner_padding < 1:
+                # The thumbnail may cover the baked-in border, so draw it on top
+                draw.rectangle([x, y, x + thumb, y + thumb], outline=(130, 130, 130, 255), width=1)
 
-        px = x + (thumb - fitted.width) // 2
-        py = y + (thumb - fitted.height) // 2
-        sheet.alpha_composite(fitted, (px, py))
-        draw.rectangle([x, y, x + thumb, y + thumb], outline=(130, 130, 130, 255), width=1)
+            labels.append(((x + 4, y + thumb + 9), f"{item.item_id} {item.width}x{item.height}"))
 
-        label = f"{item.item_id} {item.width}x{item.height}"
-        draw.text((x + 4, y + thumb + 9), label, font=font, fill=(235, 235, 235, 255))
+    # Labels sit below the tiles, so draw them all in one pass at the end.
+    for pos, label in labels:
+        draw.text(pos, label, font=font, fill=(235, 235, 235, 255))
 
     out_path.parent.mkdir(parents=True, exist_ok=True)
     sheet.save(out_path)
@@ -2,35 +2,176 @@
 """VCR MCP Server — Expose VCR rendering capabilities as MCP tools."""
 
 import asyncio
+import hashlib
+import inspect
 import json
 import logging
 import os
+import random
 import re
 import shutil
+import signal
 import sqlite3
 import subprocess
 import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import asynccontextmanager, suppress
+from functools import lru_cache
 from pathlib import Path
 
 import httpx
 from mcp.server.fastmcp import FastMCP
 from mcp.types import ToolAnnotations
 
+# Optional: with PyYAML available, malformed YAML is rejected without
+# spawning vcr check
+try:
+    import yaml
+except ImportError:  # pragma: no cover - optional dependency
+    yaml = None
+
 log = logging.getLogger("vcr-mcp")
+# Only this logger's level; FastMCP sets up handlers for the rest of the process.
+# An unrecognised VCR_LOG_LEVEL falls back to WARNING rather than failing startup.
+_log_level = os.environ.get("VCR_LOG_LEVEL", "WARNING").upper()
+if not isinstance(logging.getLevelName(_log_level), int):
+    _log_level = "WARNING"
+log.setLevel(_log_level)
 
 READ_ONLY = ToolAnnotations(readOnlyHint=True)
 
-mcp = FastMCP("vcr")
-
 VCR_HOME = Path.home() / ".vcr"
 BRAIN_DB = VCR_HOME / "brain.db"
+MANIFEST_CACHE_DB = VCR_HOME / "mcp_manifest_cache.db"
 PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
 RENDERS_DIR = PROJECT_ROOT / "renders"
+# String forms used on every subprocess call / render, computed once
+_PROJECT_ROOT_STR = os.fspath(PROJECT_ROOT)
 
 # ── LLM configuration (env vars) ─────────────────────────────────────────────
 VCR_LLM_ENDPOINT = os.environ.get("VCR_LLM_ENDPOINT", "http://127.0.0.1:1234/v1").rstrip("/")
 VCR_LLM_MODEL = os.environ.get("VCR_LLM_MODEL", "")
 VCR_LLM_API_KEY = os.environ.get("VCR_LLM_API_KEY", "")
+VCR_HTTP_MAX_CONNECTIONS = int(os.environ.get("VCR_HTTP_MAX_CONNECTIONS", "16"))
+# Requests per minute allowed to /chat/completions; 0 means no client-side limit
+VCR_LLM_RPM = int(os.environ.get("VCR_LLM_RPM", "0"))
+# Tool responses are compact JSON unless VCR_MCP_PRETTY_JSON=1
+VCR_MCP_PRETTY_JSON = os.environ.get("VCR_MCP_PRETTY_JSON", "") == "1"
+
+# How long an auto-detected model ID is reused before /models is queried again
+MODEL_CACHE_TTL = 300.0
+# Number of LLM-generated manifests kept in memory for repeated requests,
+# and how long each one stays eligible for reuse
+LLM_CACHE_SIZE = 512
+LLM_CACHE_TTL = 3600.0
+# Validated manifests are also kept on disk so a restarted server can reuse
+# them; entries older than this are swept when the cache file is opened
+LLM_DISK_CACHE_TTL = 7 * 86400.0
+# LLM attempts per vcr_synthesize_manifest call; later attempts are shown
+# the previous manifest and vcr check's errors
+SYNTH_MAX_ATTEMPTS = 2
+# Retries for a rate-limited (429), 5xx or timed-out LLM request, with full-jitter
+# exponential backoff starting at LLM_RETRY_BASE seconds and capped at
+# LLM_RETRY_MAX (a Retry-After header, when sent, takes precedence)
+LLM_MAX_RETRIES = 3
+LLM_RETRY_BASE = 1.0
+LLM_RETRY_MAX = 20.0
+# Per-attempt LLM request timeout, and the overall budget for one call
+# including every retry and backoff wait
+LLM_REQUEST_TIMEOUT = 90.0
+LLM_TOTAL_TIMEOUT = 180.0
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Request headers are fixed for the life of the process, so they are set once
+# as the shared client's defaults rather than rebuilt per request.
+_LLM_HEADERS: dict[str, str] = {"Content-Type": "application/json"}
+if VCR_LLM_API_KEY:
+    _LLM_HEADERS["Authorization"] = f"Bearer {VCR_LLM_API_KEY}"
+
+def _new_http_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        base_url=VCR_LLM_ENDPOINT,
+        timeout=httpx.Timeout(LLM_REQUEST_TIMEOUT, connect=10.0),
+        limits=httpx.Limits(
+            max_connections=VCR_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=max(1, VCR_HTTP_MAX_CONNECTIONS // 2),
+            keepalive_expiry=30.0,
+        ),
+        headers=_LLM_HEADERS,
+    )
+
+
+# Shared LLM client — keeps connections alive across tool calls instead of
+# paying a fresh TCP (+TLS) handshake on every request.
+_HTTP = _new_http_client()
+
+
+def _http() -> httpx.AsyncClient:
+    """Return the shared LLM client, reopening it if the last session closed it."""
+    global _HTTP
+    if _HTTP.is_closed:
+        _HTTP = _new_http_client()
+    return _HTTP
+
+
+_model_cache: tuple[str, float] | None = None
+# Client sessions currently inside _lifespan
+_active_sessions = 0
+# VCR_LLM_RPM pacing: the earliest time the next LLM request may start
+_llm_next_slot = 0.0
+_llm_slot_lock = asyncio.Lock()
+# key -> (validated YAML, time stored)
+_llm_cache: OrderedDict[str, tuple[str, float]] = OrderedDict()
+
+# brain.db is opened once and kept for the life of the server
+_brain: sqlite3.Connection | None = None
+_brain_lock = threading.Lock()
+# Fixed SQL text, so sqlite3's statement cache prepares each one only once;
+# the id list is bound as a single JSON array whatever its length.
+_CONTEXT_BY_IDS_SQL = (
+    "SELECT content FROM context_nodes WHERE id IN (SELECT value FROM json_each(?))"
+)
+_CONTEXT_DEFAULT_SQL = "SELECT content FROM context_nodes LIMIT 20"
+
+# Persistent manifest cache; False once opening it has failed
+_manifest_db: sqlite3.Connection | None | bool = None
+_manifest_db_lock = threading.Lock()
+
+
+async def _warm_llm_connection() -> None:
+    """Open the pooled LLM connection (and resolve the model) ahead of the first request."""
+    try:
+        if VCR_LLM_MODEL:
+            await _http().head("/models", timeout=5)
+        else:
+            await _resolve_model()
+    except Exception as exc:
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("LLM warm-up failed: %s", exc)
+
+
+@asynccontextmanager
+async def _lifespan(_server: FastMCP):
+    global _active_sessions
+    _active_sessions += 1
+    warmup = asyncio.create_task(_warm_llm_connection())
+    try:
+        yield
+    finally:
+        warmup.cancel()
+        _active_sessions -= 1
+        # SSE and streamable HTTP enter the lifespan once per client session,
+        # so shared resources are only released when no session is left using
+        # them; the next session reopens them on first use
+        if _active_sessions == 0:
+            await _HTTP.aclose()
+            _close_manifest_db()
+
+
+mcp = FastMCP("vcr", lifespan=_lifespan)
 
 SYSTEM_PROMPT = """\
 You are the VCR Engine Brain. You only output valid VCR YAML manifests.
@@ -64,9 +205,26 @@ Rules:
 
 # Load SKILL.md for the synthesizer system prompt (comprehensive manifest reference)
 _SKILL_MD_PATH = PROJECT_ROOT / "SKILL.md"
+# Only the manifest-authoring parts of SKILL.md go into the synthesizer prompt;
+# CLI usage, prompt gate and troubleshooting sections just add pre-fill tokens.
+_SKILL_MD_SECTIONS = (
+    "## Manifest Structure",
+    "## Expression Language",
+    "## Common Gotchas",
+    "## Validation Checklist",
+)
+_SKILL_MD_LIMIT = 8000
+
+
+def _slim_skill_md(text: str) -> str:
+    sections = re.split(r"(?m)^(?=## )", text)
+    kept = [sec for sec in sections if sec.startswith(_SKILL_MD_SECTIONS)]
+    return "".join(kept)[:_SKILL_MD_LIMIT]
+
+
 _SKILL_MD = ""
 if _SKILL_MD_PATH.exists():
-    _SKILL_MD = _SKILL_MD_PATH.read_text()
+    _SKILL_MD = _slim_skill_md(_SKILL_MD_PATH.read_text())
 
 SYNTHESIZER_SYSTEM_PROMPT = f"""\
 You are a VCR manifest synthesizer. You output ONLY valid VCR YAML — no prose, no markdown
@@ -91,66 +249,305 @@ STRICT RULES:
 - Image paths must be relative
 - No unknown fields (deny_unknown_fields is active)
 
-{_SKILL_MD[:8000] if _SKILL_MD else ""}
+{_SKILL_MD}
 Output the YAML now. Nothing else."""
 
+# The system prompts never change, so JSON-escape them once rather than on
+# every request body (the synthesizer one carries up to 8 KB of SKILL.md).
+_SYSTEM_PROMPT_JSON = json.dumps(SYSTEM_PROMPT)
+_SYNTHESIZER_SYSTEM_PROMPT_JSON = json.dumps(SYNTHESIZER_SYSTEM_PROMPT)
+
+
+def _chat_body(system_json: str, model: str, user_message: str) -> bytes:
+    """Serialize a streamed /chat/completions request around a pre-encoded system prompt."""
+    return (
+        f'{{"model":{json.dumps(model)},"messages":['
+        f'{{"role":"system","content":{system_json}}},'
+        f'{{"role":"user","content":{json.dumps(user_message)}}}'
+        f'],"temperature":0.0,"stream":true}}'
+    ).encode()
+
+
+async def _wait_for_llm_slot() -> None:
+    """Space LLM requests evenly so they stay under VCR_LLM_RPM."""
+    global _llm_next_slot
+    if VCR_LLM_RPM <= 0:
+        return
+    async with _llm_slot_lock:
+        now = time.monotonic()
+        start = max(now, _llm_next_slot)
+        _llm_next_slot = start + 60.0 / VCR_LLM_RPM
+    if start > now:
+        await asyncio.sleep(start - now)
+
+
+def _retry_delay(attempt: int, resp: httpx.Response | None) -> float:
+    if resp is not None:
+        retry_after = resp.headers.get("retry-after", "")
+        if retry_after.isdigit():
+            return min(float(retry_after), LLM_RETRY_MAX)
+    return random.uniform(0, min(LLM_RETRY_MAX, LLM_RETRY_BASE * 2**attempt))
+
+
+async def _chat_completion(system_json: str, model: str, user_message: str) -> str | None:
+    """Return the assistant's reply, or None if the response had no choices.
+
+    Rate-limited, 5xx and timed-out requests are retried with backoff up to
+    LLM_MAX_RETRIES times, within LLM_TOTAL_TIMEOUT overall. Raises
+    httpx.HTTPStatusError on a non-2xx response once retries are exhausted (or
+    straight away for other statuses), and httpx.TimeoutException once the
+    time budget is spent.
+    """
+    global _model_cache
+    body = _chat_body(system_json, model, user_message)
+    deadline = time.monotonic() + LLM_TOTAL_TIMEOUT
+    attempt = 0
+    while True:
+        await _wait_for_llm_slot()
+        timeout = min(LLM_REQUEST_TIMEOUT, max(deadline - time.monotonic(), 1.0))
+        try:
+            return await _stream_chat_completion(body, timeout)
+        except (httpx.HTTPStatusError, httpx.TimeoutException) as exc:
+            resp = exc.response if isinstance(exc, httpx.HTTPStatusError) else None
+            if resp is not None and resp.status_code in (400, 404):
+                # Likely the auto-detected model was unloaded or swapped;
+                # look it up again on the next call instead of after the TTL
+                _model_cache = None
+            delay = _retry_delay(attempt, resp)
+            if (
+                attempt >= LLM_MAX_RETRIES
+                or (resp is not None and resp.status_code not in _RETRY_STATUSES)
+                or time.monotonic() + delay >= deadline
+            ):
+                raise
+            attempt += 1
+            log.warning(
+                "LLM request failed (%s); retry %d/%d in %.1fs",
+                resp.status_code if resp is not None else type(exc).__name__,
+                attempt,
+                LLM_MAX_RETRIES,
+                delay,
+            )
+            await asyncio.sleep(delay)
+
+
+def _llm_timeout_error(started: float) -> str:
+    return (
+        f"ERROR: LLM request timed out after {time.monotonic() - started:.0f} seconds "
+        f"(up to {LLM_MAX_RETRIES + 1} attempts, {LLM_TOTAL_TIMEOUT:.0f}s overall)."
+    )
+
+
+async def _stream_chat_completion(body: bytes, timeout: float = LLM_REQUEST_TIMEOUT) -> str | None:
+    """POST one /chat/completions request and collect the reply.
+
+    The reply is streamed and the request abandoned once a fenced manifest has
+    closed, so trailing prose the model adds after the YAML isn't waited for.
+    Providers that ignore "stream" and answer with plain JSON are handled too.
+    """
+    async with _http().stream(
+        "POST",
+        "/chat/completions",
+        content=body,
+        timeout=timeout,
+    ) as resp:
+        if not resp.is_success:
+            await resp.aread()
+            resp.raise_for_status()
+        if not resp.headers.get("content-type", "").startswith("text/event-stream"):
+            await resp.aread()
+            choices = resp.json().get("choices", [])
+            return choices[0].get("message", {}).get("content", "") if choices else None
+
+        text = ""
+        saw_choice = False
+        version_at = -1
+        async for line in resp.aiter_lines():
+            if not line.startswith("data:"):
+                continue
+            data = line[5:].strip()
+            if data == "[DONE]":
+                break
+            choices = json.loads(data).get("choices")
+            if not choices:
+                continue
+            saw_choice = True
+            delta = choices[0].get("delta", {}).get("content")
+            if not delta:
+                continue
+            # Only rescan the new tail (plus enough overlap for a split marker)
+            scan_from = max(0, len(text) - 8)
+            text += delta
+            if version_at == -1:
+                version_at = text.find("version:", scan_from)
+            if version_at != -1 and text.find("```", max(version_at, scan_from)) != -1:
+                break
+        return text if saw_choice else None
+
+
+_VCR_NOT_FOUND = (
+    "vcr binary not found. Run `cargo build` in the VCR project root or add vcr to PATH."
+)
+# A failed lookup is only trusted this long, so a `cargo build` mid-session
+# is picked up without waiting for vcr_doctor
+VCR_BIN_MISS_TTL = 10.0
+# Result of the last binary lookup; "" records that it wasn't found
+_vcr_bin: str | None = None
+_vcr_bin_checked = 0.0
+
 
 def _find_vcr_binary() -> str:
-    """Locate the vcr binary — prefer PATH, fall back to local debug build."""
-    if shutil.which("vcr"):
-        return "vcr"
+    """Locate the vcr binary — prefer PATH, fall back to local debug build.
+
+    A found binary is cached for the life of the server. A miss is cached for
+    VCR_BIN_MISS_TTL seconds, so bursts of calls don't re-scan PATH while a
+    later `cargo build` is still noticed; vcr_doctor always re-probes.
+    """
+    global _vcr_bin, _vcr_bin_checked
+    if _vcr_bin is None or (
+        not _vcr_bin and time.monotonic() - _vcr_bin_checked > VCR_BIN_MISS_TTL
+    ):
+        _vcr_bin = _probe_vcr_binary()
+        _vcr_bin_checked = time.monotonic()
+    if not _vcr_bin:
+        raise FileNotFoundError(_VCR_NOT_FOUND)
+    return _vcr_bin
+
+
+def _probe_vcr_binary() -> str:
+    # Return the absolute path so each spawn execs it directly instead of
+    # searching PATH again
+    on_path = shutil.which("vcr")
+    if on_path:
+        return on_path
     local = PROJECT_ROOT / "target" / "debug" / "vcr"
     if local.exists():
         return str(local)
     local_release = PROJECT_ROOT / "target" / "release" / "vcr"
     if local_release.exists():
         return str(local_release)
-    raise FileNotFoundError(
-        "vcr binary not found. Run `cargo build` in the VCR project root or add vcr to PATH."
-    )
+    return ""
+
 
+def _invalidate_vcr_binary_cache() -> None:
+    global _vcr_bin
+    _vcr_bin = None
+
+
+# vcr build/render-frame spawn FFmpeg; running each vcr in its own process
+# group lets a timeout take the encoders down with it instead of orphaning them.
+if os.name == "posix":
+    _NEW_PROCESS_GROUP: dict = {"start_new_session": True}
+else:
+    _NEW_PROCESS_GROUP = {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+
+
+# Bytes read per call when streaming vcr build output
+_DRAIN_CHUNK_SIZE = 64 * 1024
+
+
+def _kill_process_group(proc: asyncio.subprocess.Process) -> None:
+    if os.name == "posix":
+        with suppress(ProcessLookupError):
+            os.killpg(proc.pid, signal.SIGKILL)
+    else:
+        proc.kill()
 
-def _run(cmd: list[str], timeout: int = 120) -> subprocess.CompletedProcess:
-    return subprocess.run(
+
+async def _run_async(cmd: list[str], timeout: int = 120) -> subprocess.CompletedProcess:
+    """Run cmd in the project root, awaiting it so other tool calls keep running."""
+    proc = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        cwd=_PROJECT_ROOT_STR,
+        **_NEW_PROCESS_GROUP,
+    )
+    try:
+        stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=timeout)
+    except asyncio.TimeoutError:
+        _kill_process_group(proc)
+        await proc.wait()
+        raise subprocess.TimeoutExpired(cmd, timeout)
+    return subprocess.CompletedProcess(
         cmd,
-        capture_output=True,
-        text=True,
-        timeout=timeout,
-        cwd=str(PROJECT_ROOT),
+        proc.returncode,
+        stdout.decode(errors="replace"),
+        stderr.decode(errors="replace"),
     )
 
 
+# libyaml's C loader when PyYAML was built with it
+_YAML_LOADER = getattr(yaml, "CSafeLoader", None) or getattr(yaml, "SafeLoader", None)
+
+
+def _yaml_syntax_error(manifest_yaml: str) -> str | None:
+    """Return a parse error for YAML that can't be a manifest, or None.
+
+    Only syntax is checked; vcr check still owns the schema. Always None when
+    PyYAML isn't installed.
+    """
+    if yaml is None:
+        return None
+    try:
+        yaml.load(manifest_yaml, Loader=_YAML_LOADER)
+    except yaml.YAMLError as exc:
+        return f"YAML parse error: {exc}"
+    return None
+
+
 def _resolve_manifest_path(manifest_path: str) -> Path:
     """Resolve manifest path to absolute Path. Paths are relative to PROJECT_ROOT."""
-    p = Path(manifest_path)
-    if not p.is_absolute():
-        p = PROJECT_ROOT / p
-    p = p.resolve()
-    if not p.exists():
+    # PROJECT_ROOT is already resolved, so a lexical normpath is enough to
+    # make the path absolute and tidy without resolve()'s per-component lstats
+    p = Path(os.path.normpath(os.path.join(_PROJECT_ROOT_STR, manifest_path)))
+    # One stat on the common path; the error branch works out which problem it is
+    if not p.is_file():
+        if p.exists():
+            raise FileNotFoundError(f"Not a file: {p}")
         raise FileNotFoundError(
             f"Manifest not found: {manifest_path}\n"
             f"Resolved to: {p}\n"
             f"Paths are relative to project root: {PROJECT_ROOT}"
         )
-    if not p.is_file():
-        raise FileNotFoundError(f"Not a file: {p}")
     return p
 
 
 def _resolve_output_path(output: str) -> Path:
     """Resolve output path relative to PROJECT_ROOT."""
-    p = Path(output)
-    if not p.is_absolute():
-        p = PROJECT_ROOT / p
-    return p.resolve()
+    return Path(os.path.normpath(os.path.join(_PROJECT_ROOT_STR, output)))
+
+
+def _write_manifest(path: str, yaml_content: str) -> None:
+    """Write a manifest atomically, so a concurrent check/build never sees a partial file."""
+    # Same directory as the target so os.replace stays a rename; open() rather
+    # than mkstemp so the file keeps the usual umask-derived permissions.
+    head, tail = os.path.split(path)
+    tmp_path = os.path.join(head, f".{tail}.{uuid.uuid4().hex}.tmp")
+    try:
+        with open(tmp_path, "x") as f:
+            f.write(yaml_content)
+        os.replace(tmp_path, path)
+    except BaseException:
+        with suppress(FileNotFoundError):
+            os.unlink(tmp_path)
+        raise
 
 
 # ── Tools ────────────────────────────────────────────────────────────────────
 
 
+def _json_dumps(obj) -> str:
+    """Serialize a tool's JSON response; the one place response formatting is set."""
+    if VCR_MCP_PRETTY_JSON:
+        return json.dumps(obj, indent=2)
+    return json.dumps(obj, separators=(",", ":"))
+
+
 @mcp.tool(annotations=READ_ONLY)
-def vcr_doctor() -> str:
+async def vcr_doctor() -> str:
     """Check VCR system health: binary availability, FFmpeg, GPU support."""
+    _invalidate_vcr_binary_cache()
     try:
         vcr = _find_vcr_binary()
     except FileNotFoundError as e:
@@ -159,18 +556,18 @@ def vcr_doctor() -> str:
             "Run `cargo build` in the VCR project root, or add the vcr binary to PATH."
         )
 
-    result = _run([vcr, "doctor"], timeout=30)
+    result = await _run_async([vcr, "doctor"], timeout=30)
     output = (result.stdout + result.stderr).strip()
     status = "HEALTHY" if result.returncode == 0 else "ISSUES DETECTED"
     return f"[{status}]\n{output}"
 
 
 @mcp.tool(annotations=READ_ONLY)
-def validate_vcr_manifest(manifest_yaml: str, run_lint: bool = True) -> str:
+async def validate_vcr_manifest(manifest_yaml: str, run_lint: bool = True) -> str:
     """Validate a VCR YAML manifest: schema (vcr check) and optionally unreachable layers (vcr lint).
 
-    Runs vcr check first for schema validation. If run_lint is True, also runs vcr lint
-    to detect layers that never become visible across the timeline.
+    Runs vcr check for schema validation. If run_lint is True, vcr lint runs alongside
+    it to detect layers that never become visible across the timeline.
 
     Args:
         manifest_yaml: The full YAML content of a .vcr manifest to validate.
@@ -181,15 +578,34 @@ def validate_vcr_manifest(manifest_yaml: str, run_lint: bool = True) -> str:
     except FileNotFoundError as e:
         return f"ERROR: {e}\n\nRun `vcr doctor` or `cargo build` in the VCR project root."
 
-    with tempfile.NamedTemporaryFile(
-        suffix=".vcr", mode="w", delete=False, dir=str(PROJECT_ROOT)
-    ) as f:
-        f.write(manifest_yaml)
-        tmp_path = f.name
+    syntax_error = _yaml_syntax_error(manifest_yaml)
+    if syntax_error:
+        return (
+            f"SCHEMA VALIDATION FAILED (YAML syntax):\n{syntax_error}\n\n"
+            "Fix the YAML syntax and retry."
+        )
 
+    # vcr check/lint only read manifests from disk, and asset paths resolve
+    # against the manifest's directory, so the file has to live in the
+    # project root. mkstemp + one raw write skips the buffered text wrapper,
+    # and creating it inside the try means a failed write is cleaned up too.
+    fd, tmp_path = tempfile.mkstemp(suffix=".vcr", dir=_PROJECT_ROOT_STR)
     try:
-        # 1. Schema validation (vcr check) — fast, required for any render
-        check_result = _run([vcr, "check", tmp_path], timeout=30)
+        try:
+            os.write(fd, manifest_yaml.encode())
+        finally:
+            os.close(fd)
+
+        # Schema validation (vcr check) and unreachable layer analysis
+        # (vcr lint, optional, samples frames) don't depend on each other, so
+        # both processes run at once; lint's result only matters if check passes
+        if run_lint:
+            check_result, lint_result = await asyncio.gather(
+                _run_async([vcr, "check", tmp_path], timeout=30),
+                _run_async([vcr, "lint", tmp_path], timeout=60),
+            )
+        else:
+            check_result = await _run_async([vcr, "check", tmp_path], timeout=30)
         check_out = (check_result.stdout + check_result.stderr).strip()
         if check_result.returncode != 0:
             return (
@@ -197,9 +613,7 @@ def validate_vcr_manifest(manifest_yaml: str, run_lint: bool = True) -> str:
                 "Fix schema errors (typos, unknown fields, invalid values) and retry."
             )
 
-        # 2. Unreachable layer analysis (vcr lint) — optional, samples frames
         if run_lint:
-            lint_result = _run([vcr, "lint", tmp_path], timeout=60)
             lint_out = (lint_result.stdout + lint_result.stderr).strip()
             if lint_result.returncode != 0:
                 return (
@@ -216,13 +630,13 @@ def validate_vcr_manifest(manifest_yaml: str, run_lint: bool = True) -> str:
 
 
 @mcp.tool(annotations=READ_ONLY)
-def lint_vcr_manifest(manifest_yaml: str) -> str:
+async def lint_vcr_manifest(manifest_yaml: str) -> str:
     """Validate a VCR YAML manifest (alias for validate_vcr_manifest). Prefer validate_vcr_manifest."""
-    return validate_vcr_manifest(manifest_yaml, run_lint=True)
+    return await validate_vcr_manifest(manifest_yaml, run_lint=True)
 
 
 @mcp.tool()
-def vcr_render_frame(
+async def vcr_render_frame(
     manifest_path: str,
     frame: int = 0,
     output: str | None = None,
@@ -258,89 +672,276 @@ def vcr_render_frame(
     output_abs = _resolve_output_path(output)
     output_abs.parent.mkdir(parents=True, exist_ok=True)
 
-    result = _run(
-        [vcr, "render-frame", str(manifest_abs), "--frame", str(frame), "-o", str(output_abs), "--backend", backend],
+    result = await _run_async(
+        [vcr, "render-frame", os.fspath(manifest_abs), "--frame", str(frame), "-o", os.fspath(output_abs), "--backend", backend],
         timeout=60,
     )
     out = (result.stdout + result.stderr).strip()
     if result.returncode != 0:
         return f"RENDER FRAME FAILED:\n{out}\n\nRun `vcr doctor` to verify dependencies."
 
-    return json.dumps({
+    return _json_dumps({
         "status": "OK",
-        "output": str(output_abs),
+        "output": os.fspath(output_abs),
         "manifest": manifest_path,
         "frame": frame,
         "backend": backend,
-    }, indent=2)
+    })
 
 
-@mcp.tool(annotations=READ_ONLY)
-def vcr_list_examples() -> str:
-    """List available VCR example manifests in the examples/ directory.
+# The description comment sits at the top of an example, so only this much
+# of each file is read
+_EXAMPLE_HEAD_BYTES = 512
+# example path -> (mtime_ns, description), so unchanged files aren't re-read
+_example_desc_cache: dict[str, tuple[int, str]] = {}
 
-    Returns paths and descriptions for reference when creating or modifying manifests.
-    Use these as starting points or to understand VCR capabilities.
-    """
+
+def _example_description(entry: os.DirEntry) -> str:
+    """Return the first descriptive comment line of an example manifest, or ""."""
+    mtime_ns = entry.stat().st_mtime_ns
+    cached = _example_desc_cache.get(entry.path)
+    if cached is not None and cached[0] == mtime_ns:
+        return cached[1]
+
+    desc = ""
+    with open(entry.path, "rb") as fh:
+        head = fh.read(_EXAMPLE_HEAD_BYTES).decode("utf-8", "replace")
+    for line in head.splitlines():
+        line = line.strip()
+        if line.startswith("#") and "Render:" not in line and "Preview:" not in line:
+            desc = line.lstrip("#").strip()
+            break
+    _example_desc_cache[entry.path] = (mtime_ns, desc)
+    return desc
+
+
+def _scan_examples() -> str:
+    """Build the vcr_list_examples response (blocking; run off the event loop)."""
     examples_dir = PROJECT_ROOT / "examples"
     if not examples_dir.exists():
-        return json.dumps({"examples": [], "note": "examples/ directory not found"}, indent=2)
-
-    files = sorted(examples_dir.glob("*.vcr"))
+        return _json_dumps({"examples": [], "note": "examples/ directory not found"})
+
+    # One directory read; names, paths and file types come from the entries
+    # themselves, so there's no per-file Path work beyond the mtime stat
+    with os.scandir(examples_dir) as it:
+        entries = sorted(
+            (e for e in it if e.name.endswith(".vcr") and e.is_file()),
+            key=lambda e: e.name,
+        )
     examples = []
-    for f in files:
-        rel = str(f.relative_to(PROJECT_ROOT))
+    for entry in entries:
         # Try to extract a one-line comment from the file
-        desc = ""
         try:
-            first_lines = f.read_text()[:500]
-            for line in first_lines.splitlines():
-                line = line.strip()
-                if line.startswith("#") and "Render:" not in line and "Preview:" not in line:
-                    desc = line.lstrip("#").strip()
-                    break
+            desc = _example_description(entry)
         except Exception:
-            pass
-        examples.append({"path": rel, "name": f.stem, "description": desc or "(no description)"})
-
-    return json.dumps({
+            desc = ""
+        examples.append({
+            "path": f"examples/{entry.name}",
+            "name": entry.name[:-4],
+            "description": desc or "(no description)",
+        })
+
+    return _json_dumps({
         "examples": examples,
         "count": len(examples),
         "usage": "Use vcr_render_frame or vcr_execute_plan with these paths, e.g. examples/demo_scene.vcr",
-    }, indent=2)
+    })
+
+
+@mcp.tool(annotations=READ_ONLY)
+async def vcr_list_examples() -> str:
+    """List available VCR example manifests in the examples/ directory.
+
+    Returns paths and descriptions for reference when creating or modifying manifests.
+    Use these as starting points or to understand VCR capabilities.
+    """
+    return await asyncio.to_thread(_scan_examples)
+
+
+_YAML_FENCE_RE = re.compile(r"```(?:yaml)?\n?(.*?)```", re.DOTALL)
+_SLUG_RE = re.compile(r"[^a-z0-9]+")
+_RESOLUTION_RE = re.compile(r"(\d+)x(\d+)")
 
 
 def _extract_yaml(content: str) -> str:
     """Extract YAML manifest from LLM response text."""
-    # Prefer the version: marker
-    if "version:" in content:
-        idx = content.index("version:")
-        yaml_text = content[idx:]
-        if "```" in yaml_text:
-            yaml_text = yaml_text.split("```")[0]
-        return yaml_text.strip()
+    # Prefer the version: marker, up to the next closing fence (if any)
+    start = content.find("version:")
+    if start != -1:
+        end = content.find("```", start)
+        return (content[start:end] if end != -1 else content[start:]).strip()
     # Fallback: code-block extraction
-    m = re.search(r"```(?:yaml)?\n?(.*?)```", content, re.DOTALL)
+    m = _YAML_FENCE_RE.search(content)
     if m:
         return m.group(1).strip()
     return content.strip()
 
 
-async def _resolve_model(client: httpx.AsyncClient) -> str:
-    """Return the model ID to use, auto-detecting from /models if needed."""
+async def _resolve_model() -> str:
+    """Return the model ID to use, auto-detecting from /models if needed.
+
+    Auto-detected IDs are cached for MODEL_CACHE_TTL seconds.
+    """
+    global _model_cache
     if VCR_LLM_MODEL:
         return VCR_LLM_MODEL
+    if _model_cache and time.monotonic() - _model_cache[1] < MODEL_CACHE_TTL:
+        return _model_cache[0]
     try:
-        resp = await client.get(f"{VCR_LLM_ENDPOINT}/models", timeout=10)
+        resp = await _http().get("/models", timeout=10)
         resp.raise_for_status()
         data = resp.json().get("data", [])
         if data:
-            return data[0]["id"]
+            model = data[0]["id"]
+            _model_cache = (model, time.monotonic())
+            return model
     except Exception as exc:
-        log.debug("Model auto-detect failed: %s", exc)
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("Model auto-detect failed: %s", exc)
     return "local-model"
 
 
+_SPACE_RE = re.compile(r"\s+")
+# Bumped whenever the key scheme changes, so entries stored on disk under an
+# older scheme are never matched
+_LLM_CACHE_KEY_VERSION = "2"
+
+
+def _normalize_prompt(prompt: str) -> str:
+    """Collapse runs of whitespace; case and punctuation can change what gets rendered."""
+    return _SPACE_RE.sub(" ", prompt).strip()
+
+
+def _llm_cache_key(*parts: str) -> str:
+    return hashlib.blake2b(
+        "\0".join((_LLM_CACHE_KEY_VERSION, *parts)).encode(), digest_size=16
+    ).hexdigest()
+
+
+def _manifest_db_conn() -> sqlite3.Connection | None:
+    """Return the persistent manifest cache connection, creating the file on first use.
+
+    This is a separate file from brain.db, which belongs to the Intelligence
+    Tree and is only ever opened read-only here. Call with _manifest_db_lock held.
+    """
+    global _manifest_db
+    if _manifest_db is None:
+        try:
+            VCR_HOME.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(
+                str(MANIFEST_CACHE_DB), check_same_thread=False, isolation_level=None
+            )
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS manifest_cache("
+                "key TEXT PRIMARY KEY, yaml TEXT NOT NULL, ts REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS manifest_cache_ts ON manifest_cache(ts)")
+            conn.execute(
+                "DELETE FROM manifest_cache WHERE ts < ?", (time.time() - LLM_DISK_CACHE_TTL,)
+            )
+            _manifest_db = conn
+        except (OSError, sqlite3.Error) as exc:
+            log.warning("Manifest cache disabled: %s", exc)
+            _manifest_db = False
+    return _manifest_db or None
+
+
+def _close_manifest_db() -> None:
+    global _manifest_db
+    with _manifest_db_lock:
+        if _manifest_db:
+            _manifest_db.close()
+        # None rather than False, so a later session opens it again
+        _manifest_db = None
+
+
+def _disk_cache_get(key: str) -> str | None:
+    with _manifest_db_lock:
+        conn = _manifest_db_conn()
+        if conn is None:
+            return None
+        try:
+            row = conn.execute(
+                "SELECT yaml FROM manifest_cache WHERE key = ? AND ts >= ?",
+                (key, time.time() - LLM_DISK_CACHE_TTL),
+            ).fetchone()
+        except sqlite3.Error as exc:
+            log.warning("Manifest cache read failed: %s", exc)
+            return None
+    return row[0] if row else None
+
+
+def _disk_cache_put(key: str, yaml_content: str) -> None:
+    with _manifest_db_lock:
+        conn = _manifest_db_conn()
+        if conn is None:
+            return
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO manifest_cache(key, yaml, ts) VALUES (?, ?, ?)",
+                (key, yaml_content, time.time()),
+            )
+        except sqlite3.Error as exc:
+            log.warning("Manifest cache write failed: %s", exc)
+
+
+async def _llm_cache_get(key: str) -> str | None:
+    entry = _llm_cache.get(key)
+    if entry is not None:
+        yaml_content, stored_at = entry
+        if time.monotonic() - stored_at <= LLM_CACHE_TTL:
+            _llm_cache.move_to_end(key)
+            return yaml_content
+        del _llm_cache[key]
+    # sqlite (and opening the cache file on first use) stays off the event loop
+    yaml_content = await asyncio.to_thread(_disk_cache_get, key)
+    if yaml_content is not None:
+        _llm_cache_remember(key, yaml_content)
+    return yaml_content
+
+
+def _llm_cache_remember(key: str, yaml_content: str) -> None:
+    _llm_cache[key] = (yaml_content, time.monotonic())
+    _llm_cache.move_to_end(key)
+    while len(_llm_cache) > LLM_CACHE_SIZE:
+        _llm_cache.popitem(last=False)
+
+
+async def _llm_cache_put(key: str, yaml_content: str) -> None:
+    _llm_cache_remember(key, yaml_content)
+    await asyncio.to_thread(_disk_cache_put, key, yaml_content)
+
+
+def _brain_conn() -> sqlite3.Connection | None:
+    """Return the shared read-only brain.db connection, opening it on first use."""
+    global _brain
+    if _brain is None and BRAIN_DB.exists():
+        conn = sqlite3.connect(
+            str(BRAIN_DB), check_same_thread=False, isolation_level=None
+        )
+        conn.execute("PRAGMA query_only = ON")
+        conn.execute("PRAGMA mmap_size = 268435456")
+        conn.execute("PRAGMA cache_size = -65536")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        _brain = conn
+    return _brain
+
+
+def _read_context(context_ids: list[str] | None) -> str:
+    """Fetch Intelligence Tree context from brain.db (blocking; run off the event loop)."""
+    with _brain_lock:
+        conn = _brain_conn()
+        if conn is None:
+            return ""
+        if context_ids:
+            rows = conn.execute(_CONTEXT_BY_IDS_SQL, (json.dumps(context_ids),)).fetchall()
+        else:
+            rows = conn.execute(_CONTEXT_DEFAULT_SQL).fetchall()
+    return "\n".join(r[0] for r in rows)
+
+
 @mcp.tool()
 async def render_video_from_prompt(
     prompt: str, context_ids: list[str] | None = None
@@ -361,85 +962,57 @@ async def render_video_from_prompt(
     """
     status_log: list[str] = []
 
-    # 1. Gather context from brain.db
-    context_str = ""
-    if BRAIN_DB.exists():
+    async def read_context() -> str:
         try:
-            conn = sqlite3.connect(str(BRAIN_DB))
-            if context_ids:
-                placeholders = ",".join("?" for _ in context_ids)
-                rows = conn.execute(
-                    f"SELECT content FROM context_nodes WHERE id IN ({placeholders})",
-                    context_ids,
-                ).fetchall()
-            else:
-                rows = conn.execute(
-                    "SELECT content FROM context_nodes LIMIT 20"
-                ).fetchall()
-            conn.close()
-            context_str = "\n".join(r[0] for r in rows)
+            return await asyncio.to_thread(_read_context, context_ids)
         except Exception as e:
-            context_str = f"(brain.db read failed: {e})"
+            return f"(brain.db read failed: {e})"
+
+    # 1. Gather context from brain.db; the model lookup is independent, so
+    # it runs alongside (_resolve_model falls back to "local-model" itself)
+    context_str, model = await asyncio.gather(read_context(), _resolve_model())
 
     status_log.append("Reading Intelligence Tree...")
 
     # 2. Query LLM via OpenAI-compatible API
-    headers: dict[str, str] = {"Content-Type": "application/json"}
-    if VCR_LLM_API_KEY:
-        headers["Authorization"] = f"Bearer {VCR_LLM_API_KEY}"
-
-    async with httpx.AsyncClient() as client:
-        # Resolve model
-        status_log.append("Syncing with LLM provider...")
-        try:
-            model = await _resolve_model(client)
-        except Exception:
-            model = "local-model"
-
-        user_message = (
-            f"Creative Context from Intelligence Tree:\n{context_str}\n\n"
-            f"User Request: {prompt}\n\nGenerate the YAML manifest now:"
-        )
-
-        payload = {
-            "model": model,
-            "messages": [
-                {"role": "system", "content": SYSTEM_PROMPT},
-                {"role": "user", "content": user_message},
-            ],
-            "temperature": 0.0,
-        }
-
+    status_log.append("Syncing with LLM provider...")
+
+    user_message = "".join((
+        "Creative Context from Intelligence Tree:\n", context_str,
+        "\n\nUser Request: ", prompt,
+        "\n\nGenerate the YAML manifest now:",
+    ))
+
+    # Repeat requests (same model, context and prompt) reuse the
+    # earlier generation instead of another LLM round-trip.
+    cache_key = _llm_cache_key(model, SYSTEM_PROMPT, context_str, _normalize_prompt(prompt))
+    yaml_content = await _llm_cache_get(cache_key)
+    cached = yaml_content is not None
+    if cached:
+        status_log.append(f"Reusing cached manifest (model: {model})")
+    else:
         status_log.append(f"Thinking... (model: {model})")
+        llm_started = time.monotonic()
         try:
-            resp = await client.post(
-                f"{VCR_LLM_ENDPOINT}/chat/completions",
-                json=payload,
-                headers=headers,
-                timeout=90,
-            )
-            resp.raise_for_status()
+            content = await _chat_completion(_SYSTEM_PROMPT_JSON, model, user_message)
         except httpx.ConnectError:
             return (
                 f"ERROR: Could not connect to LLM at {VCR_LLM_ENDPOINT}.\n\n"
                 "Ensure your LLM provider is running (e.g. LM Studio on 127.0.0.1:1234). "
                 "Set VCR_LLM_ENDPOINT, VCR_LLM_MODEL, and optionally VCR_LLM_API_KEY."
             )
+        except httpx.TimeoutException:
+            return _llm_timeout_error(llm_started)
         except httpx.HTTPStatusError as exc:
             return f"ERROR: LLM returned HTTP {exc.response.status_code}: {exc.response.text[:500]}"
-        except httpx.TimeoutException:
-            return "ERROR: LLM request timed out after 90 seconds."
 
-    ai_resp = resp.json()
-    choices = ai_resp.get("choices", [])
-    if not choices:
-        return "ERROR: LLM returned empty response (no choices)."
+        if content is None:
+            return "ERROR: LLM returned empty response (no choices)."
 
-    content = choices[0].get("message", {}).get("content", "")
-    yaml_content = _extract_yaml(content)
+        yaml_content = _extract_yaml(content)
 
-    if not yaml_content:
-        return "ERROR: Could not extract YAML manifest from LLM response."
+        if not yaml_content:
+            return "ERROR: Could not extract YAML manifest from LLM response."
 
     # 3. Write manifest, lint, build
     try:
@@ -449,53 +1022,161 @@ async def render_video_from_prompt(
 
     RENDERS_DIR.mkdir(parents=True, exist_ok=True)
 
-    manifest_path = str(PROJECT_ROOT / "agent_manifest.yaml")
-    with open(manifest_path, "w") as f:
-        f.write(yaml_content)
-
-    # Schema validation (vcr check) — required before build
-    check_result = _run([vcr, "check", manifest_path], timeout=30)
-    if check_result.returncode != 0:
-        check_out = (check_result.stdout + check_result.stderr).strip()
-        return (
-            f"SCHEMA VALIDATION FAILED (manifest rejected):\n{check_out}\n\n"
-            f"Generated YAML:\n{yaml_content}\n\n"
-            "Fix schema errors and retry, or use validate_vcr_manifest to debug."
+    # Each call gets its own manifest and output, so overlapping renders never
+    # overwrite each other's files. Asset paths resolve against the manifest's
+    # directory, so the manifest lives in the project root, and only for the
+    # length of the call.
+    run_id = uuid.uuid4().hex[:8]
+    slug = _SLUG_RE.sub("_", prompt.lower().strip())[:40].strip("_") or "render"
+    manifest_path = os.fspath(PROJECT_ROOT / f".agentic_{run_id}.vcr")
+    output_path = os.fspath(RENDERS_DIR / f"agentic_{slug}_{run_id}.mov")
+    _write_manifest(manifest_path, yaml_content)
+    try:
+        return await _build_agentic_render(
+            vcr, manifest_path, output_path, yaml_content, cached, cache_key, status_log
         )
+    finally:
+        with suppress(FileNotFoundError):
+            os.unlink(manifest_path)
+
 
-    status_log.append("Manifest validated. Starting GPU render...")
+async def _build_agentic_render(
+    vcr: str,
+    manifest_path: str,
+    output_path: str,
+    yaml_content: str,
+    cached: bool,
+    cache_key: str,
+    status_log: list[str],
+) -> str:
+    """Build render_video_from_prompt's manifest and format the tool result."""
+    # vcr build loads and validates the manifest exactly as vcr check does,
+    # so build straight away and only run check to explain a failure
+    status_log.append("Starting GPU render...")
 
-    # Build
-    output_path = str(RENDERS_DIR / "agentic_result.mov")
     proc = await asyncio.create_subprocess_exec(
         vcr, "build", manifest_path, "-o", output_path,
         stdout=asyncio.subprocess.PIPE,
         stderr=asyncio.subprocess.PIPE,
-        cwd=str(PROJECT_ROOT),
+        cwd=_PROJECT_ROOT_STR,
+        **_NEW_PROCESS_GROUP,
     )
 
+    # Consume output as it arrives so build progress lands in the log
+    # immediately rather than after the whole render has been buffered.
+    stdout_chunks: list[bytes] = []
+    stderr_chunks: list[bytes] = []
+
+    async def drain(stream: asyncio.StreamReader, sink: list[bytes]) -> None:
+        # Read fixed-size chunks rather than lines: StreamReader refuses lines
+        # over its 64 KiB limit. Output stays as bytes; only complete progress
+        # lines are decoded here.
+        partial = bytearray()
+        while chunk := await stream.read(_DRAIN_CHUNK_SIZE):
+            sink.append(chunk)
+            partial += chunk
+            end = partial.rfind(b"\n")
+            if end < 0:
+                continue
+            for raw in partial[:end].split(b"\n"):
+                if b"rendered frame" in raw:
+                    status_log.append(raw.decode(errors="replace").strip())
+            del partial[:end + 1]
+        if b"rendered frame" in partial:
+            status_log.append(partial.decode(errors="replace").strip())
+
     try:
-        stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=180)
+        await asyncio.wait_for(
+            asyncio.gather(
+                drain(proc.stdout, stdout_chunks),
+                drain(proc.stderr, stderr_chunks),
+                proc.wait(),
+            ),
+            timeout=180,
+        )
     except asyncio.TimeoutError:
-        proc.kill()
         return "ERROR: Render timed out after 180 seconds."
-
-    # Parse build progress from stderr
-    for line in (stderr or b"").decode().splitlines():
-        line = line.strip()
-        if "rendered frame" in line:
-            status_log.append(line)
+    finally:
+        # Covers the timeout as well as anything else that ends the wait early
+        if proc.returncode is None:
+            _kill_process_group(proc)
+            await proc.wait()
 
     if proc.returncode != 0:
-        build_err = (stdout or b"").decode() + (stderr or b"").decode()
+        # Checked even when cached: the cache key doesn't cover the vcr version,
+        # so a manifest that passed before can be rejected now
+        check_result = await _run_async([vcr, "check", manifest_path], timeout=30)
+        if check_result.returncode != 0:
+            check_out = (check_result.stdout + check_result.stderr).strip()
+            return (
+                f"SCHEMA VALIDATION FAILED (manifest rejected):\n{check_out}\n\n"
+                f"Generated YAML:\n{yaml_content}\n\n"
+                "Fix schema errors and retry, or use validate_vcr_manifest to debug."
+            )
+        build_err = b"".join(stdout_chunks + stderr_chunks).decode(errors="replace")
         return f"RENDER FAILED (exit {proc.returncode}):\n{build_err.strip()}"
 
-    abs_path = str(Path(output_path).resolve())
-    return f"RENDER COMPLETE\nOutput: {abs_path}\n\nLog:\n" + "\n".join(status_log)
+    # Only manifests that got through a build are worth replaying
+    if not cached:
+        await _llm_cache_put(cache_key, yaml_content)
+
+    # PROJECT_ROOT is already resolved, so the output path is absolute as-is
+    return f"RENDER COMPLETE\nOutput: {output_path}\n\nLog:\n" + "\n".join(status_log)
+
+
+ALPHA_VALIDATION_STEP = "Expect pix_fmt=yuva444p10le (alpha present)"
+
+
+def _base_plan(
+    prompt: str, res: str, fps_val: int, dur: float, alpha_val: bool, backend_val: str
+) -> tuple[dict, str]:
+    """Build the parts of a render plan shared by both vcr_render_plan branches."""
+    # Determine ProRes profile
+    prores = "4444" if alpha_val else "422hq"
+
+    # Determine output filename from prompt
+    slug = _SLUG_RE.sub("_", prompt.lower().strip())[:40].strip("_")
+    output_path = f"renders/{slug}.mov"
+
+    plan = {
+        "intent_summary": prompt,
+        "render_plan": {
+            "resolution": res,
+            "fps": fps_val,
+            "duration": dur,
+            "backend": backend_val,
+            "alpha": alpha_val,
+            "prores_profile": prores,
+            "determinism_mode": "on" if backend_val == "software" else "off",
+        },
+        "cli_commands": [],
+        "expected_outputs": [output_path],
+        "validation_steps": [
+            f"test -f {output_path}",
+            f"ffprobe -v error -select_streams v:0 -show_entries stream=codec_name,pix_fmt {output_path}",
+        ],
+    }
+    return plan, output_path
+
+
+@lru_cache(maxsize=512)
+def _plan_without_manifest(
+    prompt: str, res: str, fps_val: int, dur: float, alpha_val: bool, backend_val: str
+) -> str:
+    """Render plan JSON when no manifest is given — a pure function of its arguments."""
+    plan, output_path = _base_plan(prompt, res, fps_val, dur, alpha_val, backend_val)
+    plan["required_assets"] = f"A .vcr manifest matching this request. Write it, then validate with: vcr check <file>"
+    plan["cli_commands"] = [
+        "vcr check <MANIFEST_PATH>",
+        f"vcr build <MANIFEST_PATH> -o {output_path} --backend {backend_val}",
+    ]
+    if alpha_val:
+        plan["validation_steps"].append(ALPHA_VALIDATION_STEP)
+    return _json_dumps(plan)
 
 
 @mcp.tool(annotations=READ_ONLY)
-def vcr_render_plan(
+async def vcr_render_plan(
     prompt: str,
     resolution: str | None = None,
     fps: int | None = None,
@@ -539,66 +1220,34 @@ def vcr_render_plan(
     if backend_val not in ("software", "gpu", "auto"):
         return f"ERROR: backend must be 'software', 'gpu', or 'auto', got '{backend_val}'"
 
-    # Determine ProRes profile
-    prores = "4444" if alpha_val else "422hq"
+    if not manifest_path:
+        return _plan_without_manifest(prompt, res, fps_val, dur, alpha_val, backend_val)
 
-    # Determine output filename from prompt
-    slug = re.sub(r"[^a-z0-9]+", "_", prompt.lower().strip())[:40].strip("_")
-    output_path = f"renders/{slug}.mov"
+    plan, output_path = _base_plan(prompt, res, fps_val, dur, alpha_val, backend_val)
 
-    # Build plan
-    plan = {
-        "intent_summary": prompt,
-        "render_plan": {
-            "resolution": res,
-            "fps": fps_val,
-            "duration": dur,
-            "backend": backend_val,
-            "alpha": alpha_val,
-            "prores_profile": prores,
-            "determinism_mode": "on" if backend_val == "software" else "off",
-        },
-        "cli_commands": [],
-        "expected_outputs": [output_path],
-        "validation_steps": [
-            f"test -f {output_path}",
-            f"ffprobe -v error -select_streams v:0 -show_entries stream=codec_name,pix_fmt {output_path}",
-        ],
-    }
-
-    # If manifest provided, validate it
-    if manifest_path:
-        try:
-            vcr = _find_vcr_binary()
-            manifest_abs = _resolve_manifest_path(manifest_path)
-        except FileNotFoundError as e:
-            return f"ERROR: {e}"
-
-        check_result = _run([vcr, "check", str(manifest_abs)], timeout=30)
-        check_output = (check_result.stdout + check_result.stderr).strip()
+    # Manifest provided: validate it (not cached, the file can change)
+    try:
+        vcr = _find_vcr_binary()
+        manifest_abs = _resolve_manifest_path(manifest_path)
+    except FileNotFoundError as e:
+        return f"ERROR: {e}"
 
-        if check_result.returncode != 0:
-            plan["manifest_validation"] = f"FAILED: {check_output}"
-            return json.dumps(plan, indent=2)
-
-        plan["manifest_validation"] = "PASSED"
-        plan["cli_commands"] = [
-            f"vcr check {manifest_path}",
-            f"vcr build {manifest_path} -o {output_path} --backend {backend_val}",
-        ]
-    else:
-        plan["required_assets"] = f"A .vcr manifest matching this request. Write it, then validate with: vcr check <file>"
-        plan["cli_commands"] = [
-            "vcr check <MANIFEST_PATH>",
-            f"vcr build <MANIFEST_PATH> -o {output_path} --backend {backend_val}",
-        ]
+    check_result = await _run_async([vcr, "check", os.fspath(manifest_abs)], timeout=30)
+    check_output = (check_result.stdout + check_result.stderr).strip()
 
+    if check_result.returncode != 0:
+        plan["manifest_validation"] = f"FAILED: {check_output}"
+        return _json_dumps(plan)
+
+    plan["manifest_validation"] = "PASSED"
+    plan["cli_commands"] = [
+        f"vcr check {manifest_path}",
+        f"vcr build {manifest_path} -o {output_path} --backend {backend_val}",
+    ]
     if alpha_val:
-        plan["validation_steps"].append(
-            "Expect pix_fmt=yuva444p10le (alpha present)"
-        )
+        plan["validation_steps"].append(ALPHA_VALIDATION_STEP)
 
-    return json.dumps(plan, indent=2)
+    return _json_dumps(plan)
 
 
 @mcp.tool()
@@ -613,8 +1262,9 @@ async def vcr_synthesize_manifest(
 ) -> str:
     """Generate a valid VCR YAML manifest from a natural language description.
 
-    Writes the manifest to disk and validates it with `vcr check`. Returns the
-    manifest YAML and validation result. Does NOT render — use vcr_execute_plan
+    Writes the manifest to disk and validates it with `vcr check`; a rejected
+    manifest is sent back to the LLM with the errors for another attempt. Returns
+    the manifest YAML and validation result. Does NOT render — use vcr_execute_plan
     or vcr build separately.
 
     Args:
@@ -630,11 +1280,47 @@ async def vcr_synthesize_manifest(
         return f"ERROR: backend must be 'software', 'gpu', or 'auto', got '{backend}'"
 
     # Parse resolution
-    m = re.match(r"(\d+)x(\d+)", resolution)
+    m = _RESOLUTION_RE.match(resolution)
     if not m:
         return f"ERROR: resolution must be WIDTHxHEIGHT, got '{resolution}'"
     width, height = int(m.group(1)), int(m.group(2))
 
+    # Call LLM to generate manifest, unless the same request already
+    # produced one that passed vcr check
+    try:
+        model = await _resolve_model()
+    except Exception:
+        model = "local-model"
+
+    cache_key = _llm_cache_key(
+        model,
+        SYNTHESIZER_SYSTEM_PROMPT,
+        _normalize_prompt(prompt),
+        f"{width}x{height}|{fps}|{duration}|{alpha}|{backend}",
+    )
+
+    slug = _SLUG_RE.sub("_", prompt.lower().strip())[:40].strip("_")
+    manifest_file = output_manifest or f"{slug}.vcr"
+    manifest_abs = os.fspath(PROJECT_ROOT / manifest_file)
+
+    yaml_content = await _llm_cache_get(cache_key)
+    if yaml_content is not None:
+        # The key doesn't cover what vcr check also depends on (the manifest's
+        # directory for asset paths, the vcr version), so a hit is re-checked
+        # where it was written; still far cheaper than an LLM call. A hit that
+        # fails is regenerated below.
+        _write_manifest(manifest_abs, yaml_content)
+        try:
+            check = await _run_async([_find_vcr_binary(), "check", manifest_abs], timeout=30)
+        except FileNotFoundError:
+            check = None
+        if check is not None and check.returncode == 0:
+            return _json_dumps({
+                "manifest_path": manifest_file,
+                "validation": "PASSED",
+                "yaml": yaml_content,
+            })
+
     # Build the render plan context for the LLM
     render_plan = json.dumps({
         "prompt": prompt,
@@ -646,81 +1332,122 @@ async def vcr_synthesize_manifest(
         "prores_profile": "4444" if alpha else "422hq",
     })
 
-    # Call LLM to generate manifest
-    headers: dict[str, str] = {"Content-Type": "application/json"}
-    if VCR_LLM_API_KEY:
-        headers["Authorization"] = f"Bearer {VCR_LLM_API_KEY}"
-
-    async with httpx.AsyncClient() as client:
+    # A rejected manifest is sent back with vcr check's errors for another
+    # attempt, rather than leaving the caller to re-prompt from scratch
+    user_message = render_plan
+    passed = False
+    for attempt in range(1, SYNTH_MAX_ATTEMPTS + 1):
+        llm_started = time.monotonic()
         try:
-            model = await _resolve_model(client)
-        except Exception:
-            model = "local-model"
-
-        payload = {
-            "model": model,
-            "messages": [
-                {"role": "system", "content": SYNTHESIZER_SYSTEM_PROMPT},
-                {"role": "user", "content": render_plan},
-            ],
-            "temperature": 0.0,
-        }
-
-        try:
-            resp = await client.post(
-                f"{VCR_LLM_ENDPOINT}/chat/completions",
-                json=payload,
-                headers=headers,
-                timeout=90,
-            )
-            resp.raise_for_status()
+            content = await _chat_completion(_SYNTHESIZER_SYSTEM_PROMPT_JSON, model, user_message)
         except httpx.ConnectError:
             return (
                 f"ERROR: Could not connect to LLM at {VCR_LLM_ENDPOINT}.\n\n"
                 "Ensure your LLM provider is running. Set VCR_LLM_ENDPOINT, VCR_LLM_MODEL, "
                 "and optionally VCR_LLM_API_KEY."
             )
+        except httpx.TimeoutException:
+            return _llm_timeout_error(llm_started)
         except httpx.HTTPStatusError as exc:
             return f"ERROR: LLM HTTP {exc.response.status_code}: {exc.response.text[:500]}"
-        except httpx.TimeoutException:
-            return "ERROR: LLM request timed out."
-
-    choices = resp.json().get("choices", [])
-    if not choices:
-        return "ERROR: LLM returned empty response."
 
-    content = choices[0].get("message", {}).get("content", "")
-    yaml_content = _extract_yaml(content)
-    if not yaml_content:
-        return "ERROR: Could not extract YAML from LLM response."
+        if content is None:
+            return "ERROR: LLM returned empty response."
 
-    # Write manifest
-    slug = re.sub(r"[^a-z0-9]+", "_", prompt.lower().strip())[:40].strip("_")
-    manifest_file = output_manifest or f"{slug}.vcr"
-    manifest_abs = str(PROJECT_ROOT / manifest_file)
-
-    with open(manifest_abs, "w") as f:
-        f.write(yaml_content)
+        yaml_content = _extract_yaml(content)
+        if not yaml_content:
+            return "ERROR: Could not extract YAML from LLM response."
 
-    # Validate
-    try:
-        vcr = _find_vcr_binary()
-    except FileNotFoundError as e:
-        return f"ERROR: {e}\n\nManifest written to: {manifest_file}\n\n{yaml_content}"
+        # Write manifest
+        _write_manifest(manifest_abs, yaml_content)
 
-    check = _run([vcr, "check", manifest_abs], timeout=30)
-    check_output = (check.stdout + check.stderr).strip()
+        # Validate
+        try:
+            vcr = _find_vcr_binary()
+        except FileNotFoundError as e:
+            return f"ERROR: {e}\n\nManifest written to: {manifest_file}\n\n{yaml_content}"
+
+        # Unparseable YAML goes straight back to the LLM without a vcr spawn
+        check_output = _yaml_syntax_error(yaml_content)
+        if check_output is None:
+            check = await _run_async([vcr, "check", manifest_abs], timeout=30)
+            if check.returncode == 0:
+                passed = True
+                await _llm_cache_put(cache_key, yaml_content)
+                break
+            check_output = (check.stdout + check.stderr).strip()
+        user_message = "".join((
+            render_plan,
+            "\n\nYour previous manifest failed `vcr check`:\n", check_output,
+            "\n\nPrevious manifest:\n", yaml_content,
+            "\n\nOutput a corrected manifest.",
+        ))
 
     result = {
         "manifest_path": manifest_file,
-        "validation": "PASSED" if check.returncode == 0 else f"FAILED: {check_output}",
+        "validation": "PASSED" if passed else f"FAILED: {check_output}",
         "yaml": yaml_content,
     }
 
-    if check.returncode != 0:
+    if not passed:
         result["hint"] = "Fix the errors above and re-run vcr check, or call this tool again with a refined prompt."
+    if attempt > 1:
+        result["attempts"] = attempt
 
-    return json.dumps(result, indent=2)
+    return _json_dumps(result)
+
+
+@mcp.tool()
+async def vcr_synthesize_manifest_batch(
+    requests: list[dict],
+    max_concurrency: int = 8,
+) -> str:
+    """Generate several VCR manifests at once, running the LLM calls concurrently.
+
+    Each request is an object with the same fields as vcr_synthesize_manifest:
+    "prompt" (required), and optionally "resolution", "fps", "duration", "alpha",
+    "backend", "output_manifest". Give each request its own output_manifest when
+    prompts could produce the same auto-generated filename.
+
+    Returns a JSON list with one entry per request, in order. A failing request
+    reports its error without affecting the others.
+
+    Args:
+        requests: List of vcr_synthesize_manifest argument objects.
+        max_concurrency: Maximum LLM calls in flight at once. Default: 8.
+    """
+    if not requests:
+        return "ERROR: requests must contain at least one item"
+    if max_concurrency < 1:
+        return "ERROR: max_concurrency must be >= 1"
+
+    sem = asyncio.Semaphore(max_concurrency)
+    allowed = inspect.signature(vcr_synthesize_manifest).parameters
+
+    async def one(req: dict) -> dict:
+        if not isinstance(req, dict) or not req.get("prompt"):
+            return {"error": "each request needs a 'prompt'"}
+        unknown = sorted(set(req) - set(allowed))
+        if unknown:
+            return {
+                "prompt": req["prompt"],
+                "error": f"ERROR: unknown field(s): {', '.join(unknown)}",
+            }
+        async with sem:
+            # One request failing (bad output path, vcr timeout, LLM error...)
+            # must not take the rest of the batch down with it
+            try:
+                out = await vcr_synthesize_manifest(**req)
+            except Exception as e:
+                return {"prompt": req["prompt"], "error": f"ERROR: {type(e).__name__}: {e}"}
+        if out.startswith("ERROR:"):
+            return {"prompt": req["prompt"], "error": out}
+        return {"prompt": req["prompt"], **json.loads(out)}
+
+    # Resolve the model once up front so the fan-out doesn't race to /models
+    await _resolve_model()
+    results = await asyncio.gather(*(one(req) for req in requests))
+    return _json_dumps(results)
 
 
 @mcp.tool()
@@ -728,16 +1455,22 @@ async def vcr_execute_plan(
     manifest_path: str,
     output: str | None = None,
     backend: str = "software",
+    already_validated: bool = False,
 ) -> str:
     """Validate and render a VCR manifest to ProRes video.
 
-    Runs vcr check, then vcr build. Returns the output path or error details.
+    Runs vcr build, which validates the manifest as vcr check does; check is
+    only run afterwards to report schema errors if the build fails. Returns the
+    output path or error details.
     This is the final step after vcr_render_plan and vcr_synthesize_manifest.
 
     Args:
         manifest_path: Path to the .vcr manifest (relative to project root).
         output: Output .mov path (relative). Default: renders/<manifest_name>.mov.
         backend: Render backend: "software", "gpu", "auto". Default: software.
+        already_validated: Set when the manifest already passed vcr check (e.g. it
+            came from vcr_synthesize_manifest with validation PASSED), so a failed
+            build is reported as a render failure without re-running check.
     """
     if backend not in ("software", "gpu", "auto"):
         return f"ERROR: backend must be 'software', 'gpu', or 'auto', got '{backend}'"
@@ -748,15 +1481,6 @@ async def vcr_execute_plan(
     except FileNotFoundError as e:
         return f"ERROR: {e}\n\nRun `vcr doctor` to verify the VCR binary and dependencies."
 
-    # Validate first
-    check = _run([vcr, "check", str(manifest_abs)], timeout=30)
-    if check.returncode != 0:
-        check_out = (check.stdout + check.stderr).strip()
-        return (
-            f"VALIDATION FAILED:\n{check_out}\n\n"
-            "Fix the manifest and retry. Use validate_vcr_manifest to debug schema errors."
-        )
-
     # Determine output path (relative to project root for display)
     if not output:
         RENDERS_DIR.mkdir(parents=True, exist_ok=True)
@@ -767,35 +1491,45 @@ async def vcr_execute_plan(
 
     # Render
     proc = await asyncio.create_subprocess_exec(
-        vcr, "build", str(manifest_abs), "-o", str(output_abs), "--backend", backend,
+        vcr, "build", os.fspath(manifest_abs), "-o", os.fspath(output_abs), "--backend", backend,
         stdout=asyncio.subprocess.PIPE,
         stderr=asyncio.subprocess.PIPE,
-        cwd=str(PROJECT_ROOT),
+        cwd=_PROJECT_ROOT_STR,
+        **_NEW_PROCESS_GROUP,
     )
 
     try:
         stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=300)
     except asyncio.TimeoutError:
-        proc.kill()
+        _kill_process_group(proc)
+        await proc.wait()
         return "ERROR: Render timed out after 300 seconds."
 
     if proc.returncode != 0:
-        err = (stdout or b"").decode() + (stderr or b"").decode()
+        check = None
+        if not already_validated:
+            check = await _run_async([vcr, "check", os.fspath(manifest_abs)], timeout=30)
+        if check is not None and check.returncode != 0:
+            check_out = (check.stdout + check.stderr).strip()
+            return (
+                f"VALIDATION FAILED:\n{check_out}\n\n"
+                "Fix the manifest and retry. Use validate_vcr_manifest to debug schema errors."
+            )
+        err = ((stdout or b"") + (stderr or b"")).decode(errors="replace")
         return (
             f"RENDER FAILED (exit {proc.returncode}):\n{err.strip()}\n\n"
             "Run `vcr doctor` to verify FFmpeg and GPU dependencies."
         )
 
-    return json.dumps({
+    return _json_dumps({
         "status": "RENDER COMPLETE",
-        "output": str(output_abs),
+        "output": os.fspath(output_abs),
         "manifest": manifest_path,
         "backend": backend,
         "commands_executed": [
-            f"vcr check {manifest_path}",
             f"vcr build {manifest_path} -o {output} --backend {backend}",
         ],
-    }, indent=2)
+    })
 
 
 if __name__ == "__main__":
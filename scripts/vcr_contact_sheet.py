@@ -1,47 +1,173 @@
 import sys
 import os
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from fractions import Fraction
 from PIL import Image
 
-def generate_contact_sheet(video_path, output_path):
-    if not os.path.exists(video_path):
-        print(f"Error: {video_path} not found")
-        return
+# Opt-in hardware decode (NVDEC, VideoToolbox, VAAPI, ...) for the frame
+# extraction pass; frames are still downloaded to system memory as rgba
+HWACCEL = os.environ.get("VCR_HWACCEL") == "1"
+
+def probe_video(video_path):
+    """Return (width, height, total_frames, fps) for the first video stream.
 
-    # 1. Get total frames from ffprobe
+    The frame count comes from container metadata (nb_frames, or duration x
+    frame rate), which ffprobe reads from the header; decoding every frame with
+    -count_frames is only the last resort.
+    """
     cmd = [
-        "ffprobe", "-v", "error", "-count_frames", "-select_streams", "v:0",
-        "-show_entries", "stream=nb_read_frames", "-of", "default=nokey=1:noprint_wrappers=1",
+        "ffprobe", "-v", "error", "-select_streams", "v:0",
+        "-show_entries", "stream=width,height,nb_frames,r_frame_rate,duration:format=duration",
+        "-of", "default=noprint_wrappers=1",
         video_path
     ]
+    info = {}
     try:
-        total_frames = int(subprocess.check_output(cmd).decode().strip())
-    except:
-        total_frames = 300 # Default fallback for 10s @ 30fps
+        for line in subprocess.check_output(cmd).decode().splitlines():
+            key, _, value = line.partition("=")
+            value = value.strip()
+            # The stream's duration is listed before the container's
+            if value and value != "N/A":
+                info.setdefault(key, value)
+    except (OSError, subprocess.CalledProcessError):
+        pass
 
-    # 2. Select 9 frames evenly spaced
-    frame_indices = [int(i * (total_frames - 1) / 8) for i in range(9)]
-    temp_dir = "renders/temp_frames"
-    os.makedirs(temp_dir, exist_ok=True)
-    
-    frames = []
-    for i, idx in enumerate(frame_indices):
-        frame_file = os.path.join(temp_dir, f"frame_{i}.png")
+    try:
+        width, height = int(info["width"]), int(info["height"])
+    except (KeyError, ValueError):
+        width = height = None
+
+    try:
+        fps = Fraction(info["r_frame_rate"])
+    except (KeyError, ValueError, ZeroDivisionError):
+        fps = None
+
+    total_frames = 0
+    try:
+        total_frames = int(info["nb_frames"])
+    except (KeyError, ValueError):
+        pass
+    if total_frames <= 0:
+        try:
+            # Only an estimate (durations can run past the last frame), so
+            # stay a frame short to keep the last selected frame in range
+            total_frames = int(float(info["duration"]) * Fraction(info["r_frame_rate"])) - 1
+        except (KeyError, ValueError, ZeroDivisionError):
+            pass
+    if total_frames <= 0:
         cmd = [
-            "ffmpeg", "-y", "-i", video_path,
-            "-vf", f"select=eq(n\,{idx})", "-vframes", "1",
-            frame_file
+            "ffprobe", "-v", "error", "-count_frames", "-select_streams", "v:0",
+            "-show_entries", "stream=nb_read_frames", "-of", "default=nokey=1:noprint_wrappers=1",
+            video_path
         ]
-        subprocess.run(cmd, capture_output=True)
-        if os.path.exists(frame_file):
-            frames.append(Image.open(frame_file))
+        try:
+            total_frames = int(subprocess.check_output(cmd).decode().strip())
+        except (OSError, subprocess.CalledProcessError, ValueError):
+            total_frames = 300 # Default fallback for 10s @ 30fps
+    return width, height, total_frames, fps
+
+def read_raw_frames(cmd, width, height):
+    """Run an ffmpeg command that writes rgba rawvideo to stdout and split it into images."""
+    frame_size = width * height * 4
+    data = memoryview(subprocess.run(cmd, capture_output=True).stdout)
+    # Each image shares the output buffer rather than copying its slice
+    return [
+        Image.frombuffer("RGBA", (width, height), data[i:i + frame_size], "raw", "RGBA", 0, 1)
+        for i in range(0, len(data) - frame_size + 1, frame_size)
+    ]
+
+def extract_frame(video_path, idx, fps, width, height):
+    """Extract one frame on its own, or None if ffmpeg produced nothing."""
+    if fps:
+        # Input seeking jumps via the container index instead of decoding
+        # forward from frame 0; half a frame early so rounding can't skip idx
+        seek = max(0.0, float((idx - Fraction(1, 2)) / fps))
+        cmd = ["ffmpeg", "-y", "-ss", f"{seek:.6f}", "-i", video_path, "-frames:v", "1"]
+    else:
+        cmd = ["ffmpeg", "-y", "-i", video_path, "-vf", f"select=eq(n\\,{idx})", "-vframes", "1"]
+    cmd += ["-f", "rawvideo", "-pix_fmt", "rgba", "pipe:1"]
+    frame = read_raw_frames(cmd, width, height)
+    return frame[0] if frame else None
+
+def tile_contact_sheet(video_path, frame_indices, output_path):
+    """Have ffmpeg select the frames and tile them 3x3 straight into output_path.
+
+    Returns False if ffmpeg failed, so the caller can assemble the sheet itself.
+    """
+    select_expr = "+".join(f"eq(n\\,{idx})" for idx in frame_indices)
+    cmd = [
+        "ffmpeg", "-y", "-i", video_path,
+        # Tiles the video runs out before are left transparent, like the
+        # Python mosaic's background
+        "-vf", f"select={select_expr},format=rgba,tile=3x3:color=0x00000000",
+        "-frames:v", "1", "-update", "1",
+        output_path
+    ]
+    if HWACCEL:
+        cmd[2:2] = ["-hwaccel", "auto"]
+    return subprocess.run(cmd, capture_output=True).returncode == 0
+
+def generate_contact_sheet(video_path, output_path):
+    if not os.path.exists(video_path):
+        print(f"Error: {video_path} not found")
+        return
+
+    # 1. Get frame size and total frames from ffprobe
+    w, h, total_frames, fps = probe_video(video_path)
+
+    # 2. Select 9 frames evenly spaced
+    frame_indices = [int(i * (total_frames - 1) / 8) for i in range(9)]
+
+    # Short videos repeat indices; each distinct frame is only extracted once
+    unique_indices = sorted(set(frame_indices))
+
+    # The whole sheet in one ffmpeg graph: decode once, select, tile, encode.
+    # ffmpeg can't repeat a frame within the grid, so short videos with
+    # repeated indices use the extract-and-paste path below instead.
+    if len(unique_indices) == 9 and tile_contact_sheet(video_path, unique_indices, output_path):
+        print(f"Contact sheet saved to {output_path}")
+        return
+
+    # The raw frames below are sized from the probe
+    if w is None:
+        print(f"Error: could not read the video size of {video_path}")
+        return
+
+    # One ffmpeg pass decodes the video once and pipes every selected frame,
+    # in frame order, as raw RGBA (alpha kept for ProRes 4444 renders)
+    # straight into memory: no PNG encode/decode and no temp files
+    select_expr = "+".join(f"eq(n\\,{idx})" for idx in unique_indices)
+    cmd = [
+        "ffmpeg", "-y", "-i", video_path,
+        "-vf", f"select={select_expr}", "-vsync", "0",
+        "-f", "rawvideo", "-pix_fmt", "rgba", "pipe:1"
+    ]
+    extracted = {}
+    if HWACCEL:
+        hw_cmd = cmd[:2] + ["-hwaccel", "auto"] + cmd[2:]
+        extracted = dict(zip(unique_indices, read_raw_frames(hw_cmd, w, h)))
+    if not extracted:
+        # Software decode; also the retry when hardware decode produced nothing
+        extracted = dict(zip(unique_indices, read_raw_frames(cmd, w, h)))
+
+    # Fall back to extracting any missing frames one by one; each worker
+    # just waits on its own ffmpeg process, so threads are enough
+    missing = [idx for idx in unique_indices if idx not in extracted]
+    if missing:
+        with ThreadPoolExecutor(max_workers=min(len(missing), os.cpu_count() or 1)) as pool:
+            fallback = pool.map(lambda idx: extract_frame(video_path, idx, fps, w, h), missing)
+            for idx, frame in zip(missing, fallback):
+                if frame is not None:
+                    extracted[idx] = frame
+
+    frames = [extracted[idx] for idx in frame_indices if idx in extracted]
 
     if not frames:
         print("Error: No frames extracted")
         return
 
     # 3. Create Mosaic (3x3)
-    w, h = frames[0].size
     contact_sheet = Image.new("RGBA", (w * 3, h * 3), (0, 0, 0, 0))
     
     for i, frame in enumerate(frames):
@@ -49,13 +175,9 @@ def generate_contact_sheet(video_path, output_path):
         y = (i // 3) * h
         contact_sheet.paste(frame, (x, y))
 
-    # 4. Save and Clean up
+    # 4. Save
     contact_sheet.save(output_path)
     print(f"Contact sheet saved to {output_path}")
-    
-    for i in range(len(frames)):
-        os.remove(os.path.join(temp_dir, f"frame_{i}.png"))
-    os.rmdir(temp_dir)
 
 if __name__ == "__main__":
     if len(sys.argv) < 3:
@@ -23,6 +23,7 @@ import subprocess
 import argparse
 import tempfile
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 REQUIRED_SECTIONS = [
     "intent_summary",
@@ -47,13 +48,33 @@ RENDER_PLAN_REQUIRED = {
     "backend", "alpha", "prores_profile", "source_mode", "determinism_mode",
 }
 
+# Match headers like "### 1. intent_summary", "**intent_summary**:", or just "**intent_summary**"
+# Section names are ASCII, so only they are case-insensitive, with ASCII
+# case folding; whitespace still matches Unicode spaces.
+_SECTION_RE = re.compile(
+    r"(?:^|\n)\s*(?:#{1,4}\s*\d+\.\s*|(?:\*\*))?((?ai:" + "|".join(REQUIRED_SECTIONS) + r"))(?:\*\*)?:?\s*\n"
+)
+# Match: | field | `value` | or | field | value |, one row per line
+_TABLE_ROW_RE = re.compile(
+    r"^\|[^\S\n]*(\w[\w_]*)[^\S\n]*\|[^\S\n]*`?([^|`\n]+?)`?[^\S\n]*\|",
+    re.MULTILINE,
+)
+# A whole line starting with vcr/ffprobe/test; group 1 is the line stripped
+_COMMAND_RE = re.compile(
+    r"^[^\S\n]*((?:vcr|ffprobe|test)[^\S\n][^\n]*\S)",
+    re.MULTILINE,
+)
+_RESOLUTION_RE = re.compile(r"\d+x\d+")
+_OUTPUT_RE = re.compile(r"-o\s+(\S+)")
+
+# Upper bound on concurrent vcr check processes in validate_live
+LIVE_CHECK_WORKERS = 8
+
 
 def parse_sections(text: str) -> dict[str, str]:
     """Extract named sections from markdown response."""
     sections = {}
-    # Match headers like "### 1. intent_summary", "**intent_summary**:", or just "**intent_summary**"
-    pattern = r"(?:^|\n)\s*(?:#{1,4}\s*\d+\.\s*|(?:\*\*))?(intent_summary|capability_check|render_plan|required_assets|cli_commands|expected_outputs|validation_steps)(?:\*\*)?:?\s*\n"
-    matches = list(re.finditer(pattern, text, re.IGNORECASE))
+    matches = list(_SECTION_RE.finditer(text))
 
     for i, m in enumerate(matches):
         name = m.group(1).lower()
@@ -67,11 +88,8 @@ def parse_sections(text: str) -> dict[str, str]:
 def parse_render_plan_table(text: str) -> dict[str, str]:
     """Extract key-value pairs from a markdown table."""
     fields = {}
-    for line in text.split("\n"):
-        # Match: | field | `value` | or | field | value |
-        m = re.match(r"\|\s*(\w[\w_]*)\s*\|\s*`?([^|`]+?)`?\s*\|", line)
-        if m:
-            fields[m.group(1).strip().lower()] = m.group(2).strip().lower()
+    for m in _TABLE_ROW_RE.finditer(text):
+        fields[m.group(1).strip().lower()] = m.group(2).strip().lower()
     return fields
 
 
@@ -89,10 +107,7 @@ def extract_cli_commands(text: str) -> list[str]:
                 commands.append(stripped)
     # If no fenced block found, try raw lines starting with vcr/ffprobe/test
     if not commands:
-        for line in text.split("\n"):
-            stripped = line.strip()
-            if stripped and re.match(r"^(vcr|ffprobe|test)\s", stripped):
-                commands.append(stripped)
+        commands = _COMMAND_RE.findall(text)
     return commands
 
 
@@ -101,10 +116,12 @@ def validate_schema(text: str) -> list[str]:
     errors = []
     sections = parse_sections(text)
 
-    # Check all required sections present
-    for s in REQUIRED_SECTIONS:
-        if s not in sections:
-            errors.append(f"Missing section: {s}")
+    # Check all required sections present. parse_sections only yields
+    # REQUIRED_SECTIONS names, so a full dict means none are missing.
+    if len(sections) < len(REQUIRED_SECTIONS):
+        for s in REQUIRED_SECTIONS:
+            if s not in sections:
+                errors.append(f"Missing section: {s}")
 
     if not sections:
         errors.append("No sections found. Response may not follow the required format.")
@@ -123,8 +140,8 @@ def validate_schema(text: str) -> list[str]:
         errors.append("intent_summary should be a single sentence")
 
     # Validate render_plan fields
-    if "render_plan" in sections:
-        plan = sections["render_plan"]
+    plan = sections.get("render_plan")
+    if plan is not None:
         # Could be a table or inline text
         fields = parse_render_plan_table(plan)
 
@@ -142,7 +159,7 @@ def validate_schema(text: str) -> list[str]:
 
             # Validate resolution format
             if "resolution" in fields:
-                if not re.match(r"\d+x\d+", fields["resolution"]):
+                if not _RESOLUTION_RE.match(fields["resolution"]):
                     errors.append(
                         f"render_plan.resolution = '{fields['resolution']}' "
                         f"should be WIDTHxHEIGHT"
@@ -156,32 +173,47 @@ def validate_schema(text: str) -> list[str]:
                     errors.append(f"render_plan.fps = '{fields['fps']}' is not numeric")
 
     # Validate cli_commands has vcr check before vcr build
-    if "cli_commands" in sections:
-        cmds = extract_cli_commands(sections["cli_commands"])
-        has_check = any("vcr check" in c for c in cmds)
-        has_build = any("vcr build" in c for c in cmds)
-
-        if has_build and not has_check:
+    cli = sections.get("cli_commands")
+    if cli is not None:
+        # One sweep finds the first check/build and collects output errors,
+        # which are reported after the ordering errors
+        check_idx = build_idx = -1
+        output_errors = []
+        for i, cmd in enumerate(extract_cli_commands(cli)):
+            if check_idx < 0 and "vcr check" in cmd:
+                check_idx = i
+            if "vcr build" in cmd:
+                if build_idx < 0:
+                    build_idx = i
+                # Check output is .mov for ProRes
+                if "-o" in cmd:
+                    m = _OUTPUT_RE.search(cmd)
+                    if m and not m.group(1).endswith(".mov"):
+                        output_errors.append(
+                            f"cli_commands: output '{m.group(1)}' should be .mov for ProRes"
+                        )
+
+        if build_idx >= 0 and check_idx < 0:
             errors.append("cli_commands: vcr build without preceding vcr check")
 
-        if has_check and has_build:
-            check_idx = next(i for i, c in enumerate(cmds) if "vcr check" in c)
-            build_idx = next(i for i, c in enumerate(cmds) if "vcr build" in c)
-            if check_idx > build_idx:
-                errors.append("cli_commands: vcr check must come before vcr build")
-
-        # Check output is .mov for ProRes
-        for cmd in cmds:
-            if "vcr build" in cmd and "-o" in cmd:
-                m = re.search(r"-o\s+(\S+)", cmd)
-                if m and not m.group(1).endswith(".mov"):
-                    errors.append(
-                        f"cli_commands: output '{m.group(1)}' should be .mov for ProRes"
-                    )
+        if check_idx >= 0 and build_idx >= 0 and check_idx > build_idx:
+            errors.append("cli_commands: vcr check must come before vcr build")
+
+        errors.extend(output_errors)
 
     return errors
 
 
+def _check_manifest(full_path: str) -> subprocess.CompletedProcess | None:
+    """Run vcr check on one manifest, or return None if it doesn't exist."""
+    if not os.path.exists(full_path):
+        return None
+    return subprocess.run(
+        ["vcr", "check", full_path],
+        capture_output=True, text=True, timeout=10,
+    )
+
+
 def validate_live(text: str, project_dir: str = ".") -> list[str]:
     """Extract manifests from cli_commands and run vcr check on them."""
     errors = []
@@ -192,6 +224,7 @@ def validate_live(text: str, project_dir: str = ".") -> list[str]:
 
     cmds = extract_cli_commands(sections["cli_commands"])
 
+    targets = []
     for cmd in cmds:
         if "vcr check" not in cmd:
             continue
@@ -208,20 +241,23 @@ def validate_live(text: str, project_dir: str = ".") -> list[str]:
         if "<" in manifest_path:
             continue
 
-        full_path = os.path.join(project_dir, manifest_path)
-        if not os.path.exists(full_path):
-            errors.append(f"Manifest not found: {full_path}")
-            continue
+        targets.append((manifest_path, os.path.join(project_dir, manifest_path)))
+
+    if not targets:
+        return errors
 
-        result = subprocess.run(
-            ["vcr", "check", full_path],
-            capture_output=True, text=True, timeout=10,
-        )
-        if result.returncode != 0:
-            errors.append(
-                f"vcr check {manifest_path} failed (exit {result.returncode}): "
-                f"{result.stderr.strip()}"
-            )
+    # Checks are independent and mostly spent waiting on vcr, so run them
+    # side by side and report in command order.
+    with ThreadPoolExecutor(max_workers=min(LIVE_CHECK_WORKERS, len(targets))) as pool:
+        results = pool.map(_check_manifest, [full_path for _, full_path in targets])
+        for (manifest_path, full_path), result in zip(targets, results):
+            if result is None:
+                errors.append(f"Manifest not found: {full_path}")
+            elif result.returncode != 0:
+                errors.append(
+                    f"vcr check {manifest_path} failed (exit {result.returncode}): "
+                    f"{result.stderr.strip()}"
+                )
 
     return errors
 
@@ -235,11 +271,16 @@ def main():
                        help="Project directory for resolving manifest paths")
     args = parser.parse_args()
 
+    # One bulk binary read and decode, skipping the incremental text-mode
+    # reader
     if args.input == "-":
-        text = sys.stdin.read()
+        text = sys.stdin.buffer.read().decode("utf-8", "replace")
     else:
-        with open(args.input) as f:
-            text = f.read()
+        with open(args.input, "rb") as f:
+            text = f.read().decode("utf-8", "replace")
+        # Same newline translation open() in text mode would have applied
+        if "\r" in text:
+            text = text.replace("\r\n", "\n").replace("\r", "\n")
 
     # Schema validation
     errors = validate_schema(text)